@@ -77,8 +77,9 @@ class CommandHandler:
             command_key=command_key
         )
         
+        # 注册时统一折叠大小写，匹配时只需一次字典查找
         for name in names:
-            self.commands[name.lower()] = command
+            self.commands[name.casefold()] = command
         
         self.logger.debug(f"已注册命令: {', '.join(names)}")
     
@@ -90,16 +91,18 @@ class CommandHandler:
                        plugin_manager = None,
                        **kwargs) -> Optional[str]:
         """处理命令执行"""
-        command_text = command_text.strip().lower()
+        command_text = command_text.strip().casefold()
         
         self.logger.debug(f"处理命令: '{command_text}', 参数: '{command_args}', 用户: {user_id}")
         
         # 第一步：检查是否是插件命令
         if plugin_manager:
             for cmd_name, cmd_info in plugin_manager.command_handlers.items():
-                cmd_names = cmd_info.get('names', [])
+                match_names = cmd_info.get('match_names')
+                if match_names is None:
+                    match_names = {name.casefold() for name in cmd_info.get('names', [])}
                 # 检查命令是否匹配（不区分大小写）
-                if command_text in [name.lower() for name in cmd_names]:
+                if command_text in match_names:
                     self.logger.debug(f"找到插件命令: {cmd_name}")
                     
                     handler = cmd_info.get('handler')
@@ -356,6 +359,9 @@ class CommandHandlers:
         self._is_stopping = False
         self._shutdown_event = asyncio.Event()
         self._shutdown_initiated = False
+        # 系统监控器在首次使用时创建，之后复用以保留 CPU/网络的采样状态
+        self._system_monitor = None
+        self._monitor_lock = asyncio.Lock()
     
     @property
     def msmp_client(self):
@@ -393,6 +399,9 @@ class CommandHandlers:
                 self.logger.error(f"获取玩家列表失败: {e}")
                 return f"获取玩家列表失败: {str(e)}"
             
+            if player_info is None:
+                return "获取玩家列表失败: RCON命令执行失败，请稍后重试"
+            
             lines = [f"在线人数: {player_info.current_players}/{player_info.max_players}"]
             
             if player_info.current_players > 0 and player_info.player_names:
@@ -775,10 +784,13 @@ class CommandHandlers:
                                 )
                             elif client_type == 'rcon':
                                 player_info = self.rcon_client.get_player_list()
-                                mc_server_status = (
-                                    f"运行中 (PID: {self.qq_server.server_process.pid})\n"
-                                    f"在线: {player_info.current_players}/{player_info.max_players}"
-                                )
+                                if player_info is None:
+                                    mc_server_status = f"运行中 (PID: {self.qq_server.server_process.pid}) - 状态获取失败"
+                                else:
+                                    mc_server_status = (
+                                        f"运行中 (PID: {self.qq_server.server_process.pid})\n"
+                                        f"在线: {player_info.current_players}/{player_info.max_players}"
+                                    )
                             else:
                                 mc_server_status = f"运行中 (PID: {self.qq_server.server_process.pid})"
                         else:
@@ -988,7 +1000,7 @@ class CommandHandlers:
         # 第四步：关闭日志文件
         if self.qq_server:
             try:
-                self.qq_server._close_log_file()
+                await self.qq_server._close_log_file()
                 self.logger.info("服务器日志文件已关闭")
             except Exception as e:
                 self.logger.debug(f"关闭日志文件出错: {e}")
@@ -1036,7 +1048,7 @@ class CommandHandlers:
         # 第三步：关闭日志文件
         if self.qq_server and immediate:
             try:
-                self.qq_server._close_log_file()
+                await self.qq_server._close_log_file()
             except Exception as e:
                 self.logger.debug(f"关闭日志文件出错: {e}")
         
@@ -1387,7 +1399,7 @@ class CommandHandlers:
             await self._thorough_cleanup()
             
             self.qq_server.server_process = None
-            self.qq_server._close_log_file()
+            await self.qq_server._close_log_file()
             
             return "服务器进程已强制中止"
             
@@ -1490,16 +1502,35 @@ class CommandHandlers:
             self.logger.error(f"执行 listeners 命令失败: {e}", exc_info=True)
             return f"获取监听规则失败: {e}"
 
+    async def _get_system_monitor(self):
+        """获取共享的系统监控器，psutil 未安装时抛出 ImportError"""
+        async with self._monitor_lock:
+            if self._system_monitor is None:
+                from system_monitor import SystemMonitor
+                monitor = SystemMonitor(self.logger)
+                # 启动时会同步采样一次，放到线程池中执行
+                await asyncio.get_running_loop().run_in_executor(None, monitor.start)
+                self._system_monitor = monitor
+        return self._system_monitor
+    
+    async def _run_monitor(self, func, *args):
+        """在默认线程池中执行系统监控器的阻塞查询，避免 psutil 读取阻塞事件循环"""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+    
+    def close(self):
+        """释放命令处理器持有的后台资源"""
+        if self._system_monitor is not None:
+            self._system_monitor.shutdown()
+            self._system_monitor = None
+
     async def handle_sysinfo(self, **kwargs) -> str:
         """处理sysinfo命令 - 显示系统信息"""
         try:
-            from system_monitor import SystemMonitor
-            
-            monitor = SystemMonitor(self.logger)
-            stats = monitor.get_system_stats()
+            monitor = await self._get_system_monitor()
+            stats = await self._run_monitor(monitor.get_system_stats)
             
             if stats:
-                return monitor.format_system_info(stats)
+                return await self._run_monitor(monitor.format_system_info, stats)
             else:
                 return "无法获取系统信息"
                 
@@ -1512,10 +1543,8 @@ class CommandHandlers:
     async def handle_disk(self, **kwargs) -> str:
         """处理disk命令 - 显示磁盘信息"""
         try:
-            from system_monitor import SystemMonitor
-            
-            monitor = SystemMonitor(self.logger)
-            return monitor.get_disk_info("/")
+            monitor = await self._get_system_monitor()
+            return await self._run_monitor(monitor.get_disk_info, "/")
             
         except ImportError:
             return "系统监控模块未安装,请先安装 psutil: pip install psutil"
@@ -1526,10 +1555,8 @@ class CommandHandlers:
     async def handle_process(self, **kwargs) -> str:
         """处理process命令 - 显示Java进程信息"""
         try:
-            from system_monitor import SystemMonitor
-            
-            monitor = SystemMonitor(self.logger)
-            return monitor.get_process_info("java")
+            monitor = await self._get_system_monitor()
+            return await self._run_monitor(monitor.get_process_info, "java")
             
         except ImportError:
             return "系统监控模块未安装,请先安装 psutil: pip install psutil"
@@ -1540,10 +1567,8 @@ class CommandHandlers:
     async def handle_network(self, **kwargs) -> str:
         """处理network命令 - 显示网络信息和实时带宽"""
         try:
-            from system_monitor import SystemMonitor
-            
-            monitor = SystemMonitor(self.logger)
-            return monitor.get_network_info()
+            monitor = await self._get_system_monitor()
+            return await self._run_monitor(monitor.get_network_info)
             
         except ImportError:
             return "系统监控模块未安装,请先安装 psutil: pip install psutil"
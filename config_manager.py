@@ -201,6 +201,7 @@ class ConfigManager:
                 'max_message_length': 2500,
                 'player_list_cache_ttl': 5,
                 'max_server_logs': 100,
+                'backend_supports_batch_send': False,
             },
             'scheduled_tasks': {
                 'enabled': False,
@@ -663,6 +664,10 @@ class ConfigManager:
         """获取玩家列表缓存时间（秒）"""
         return self.config.get('advanced', {}).get('player_list_cache_ttl', 5)
     
+    def is_backend_batch_send_enabled(self) -> bool:
+        """OneBot后端是否支持一次请求向多个群发送消息"""
+        return self.config.get('advanced', {}).get('backend_supports_batch_send', False)
+    
     # ============ 自定义监听器配置 ============
     def is_custom_listeners_enabled(self) -> bool:
         return self.config.get('custom_listeners', {}).get('enabled', False)
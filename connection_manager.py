@@ -305,30 +305,40 @@ class ConnectionManager:
     
     # ============ 连接操作 ============
     
-    async def connect_all(self) -> Dict[str, bool]:
-        """连接所有启用的服务"""
+    async def connect_all(self, wait_timeout: Optional[float] = None) -> Dict[str, bool]:
+        """并发连接所有启用的服务
+        
+        Args:
+            wait_timeout: 设置时先探测各服务端口，端口开放后再连接，最多等待该秒数
+        """
         if self._shutdown_mode:
             self.logger.warning("关闭模式中，跳过连接")
             return {'msmp': False, 'rcon': False}
         
-        results = {}
+        async def connect(name: str, host: str, port: int, connect_fn) -> bool:
+            if wait_timeout is not None and not await self._wait_port_open(host, port, wait_timeout):
+                self.logger.warning(f"{name}端口 {host}:{port} 在{wait_timeout}秒内未开放")
+                return False
+            return await connect_fn()
         
-        # 连接MSMP
-        if self.config_manager and self.config_manager.is_msmp_enabled() and self.msmp_client:
-            results['msmp'] = await self._connect_msmp()
-        else:
-            results['msmp'] = False
+        async def disabled() -> bool:
+            return False
         
-        # 连接RCON
-        if self.config_manager and self.config_manager.is_rcon_enabled() and self.rcon_client:
-            results['rcon'] = await self._connect_rcon()
-        else:
-            results['rcon'] = False
+        cm = self.config_manager
+        msmp_task = (
+            connect("MSMP", cm.get_msmp_host(), cm.get_msmp_port(), self._connect_msmp)
+            if cm and cm.is_msmp_enabled() and self.msmp_client else disabled()
+        )
+        rcon_task = (
+            connect("RCON", cm.get_rcon_host(), cm.get_rcon_port(), self._connect_rcon)
+            if cm and cm.is_rcon_enabled() and self.rcon_client else disabled()
+        )
+        msmp_ok, rcon_ok = await asyncio.gather(msmp_task, rcon_task)
         
         # 清空缓存，强制重新检测
         await self.cache.clear()
         
-        return results
+        return {'msmp': msmp_ok, 'rcon': rcon_ok}
     
     async def disconnect_all(self):
         """断开所有连接"""
@@ -414,9 +424,9 @@ class ConnectionManager:
             
             self.logger.info("连接MSMP服务器...")
             
-            # 使用同步方法连接（因为MSMPClient在后台线程运行）
+            # 使用同步方法连接（因为MSMPClient在后台线程运行），放到线程池中避免阻塞事件循环
             if hasattr(self.msmp_client, 'connect_sync'):
-                self.msmp_client.connect_sync()
+                await asyncio.get_running_loop().run_in_executor(None, self.msmp_client.connect_sync)
             else:
                 # 异步连接
                 await self.msmp_client.connect()
@@ -575,7 +585,7 @@ class ConnectionManager:
                     
                     # 直接调用连接方法
                     if hasattr(self.msmp_client, 'connect_sync'):
-                        self.msmp_client.connect_sync()
+                        await asyncio.get_running_loop().run_in_executor(None, self.msmp_client.connect_sync)
                     else:
                         await self.msmp_client.connect()
                     
@@ -638,17 +648,44 @@ class ConnectionManager:
     
     # ============ 服务器启动后的连接 ============
     
-    async def connect_after_server_start(self, delay: int = 5) -> Dict[str, bool]:
-        """服务器启动后连接所有服务"""
+    async def connect_after_server_start(self, timeout: float = 60) -> Dict[str, bool]:
+        """服务器启动后连接所有服务
+        
+        不再固定等待，而是并发探测各服务端口，端口可连接后立即建立连接
+        
+        Args:
+            timeout: 等待端口开放的最长时间(秒)
+        """
         if self._shutdown_mode:
             self.logger.warning(f"连接管理器处于关闭模式，跳过服务器启动后连接 (shutdown_mode={self._shutdown_mode})")
             return {'msmp': False, 'rcon': False}
         
-        self.logger.info(f"等待{delay}秒后连接服务器...")
-        await asyncio.sleep(delay)
-        
         self.logger.info(f"开始连接服务器 (shutdown_mode={self._shutdown_mode})")
-        return await self.connect_all()
+        return await self.connect_all(wait_timeout=timeout)
+    
+    async def _wait_port_open(self, host: str, port: int, timeout: float) -> bool:
+        """反复探测端口直到可以建立TCP连接，间隔逐步退避，超时返回False"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        interval = 0.5
+        
+        while not self._shutdown_mode:
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), 1.0)
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    # 探测连接可能已被对端重置，端口可连接即可
+                    pass
+                return True
+            except (OSError, asyncio.TimeoutError):
+                if loop.time() + interval >= deadline:
+                    return False
+                await asyncio.sleep(interval)
+                interval = min(interval * 1.5, 5.0)
+        
+        return False
     
     async def invalidate_all_caches(self):
         """失效所有缓存"""
@@ -4,6 +4,7 @@ import signal
 import time
 import os
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
 from config_manager import ConfigManager, ConfigValidationError
 from msmp_client import MSMPClient, ServerEventListener
@@ -13,6 +14,15 @@ from connection_manager import ConnectionManager, ConnectionStatus
 from log_system import LogManager, AdvancedLogFilter, LogArchiveManager
 from plugin_manager import PluginManager
 
+try:
+    # 可选依赖：uvloop 仅支持 Linux/macOS，未安装时使用标准事件循环
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# 默认线程池的工作线程数（控制台输入会长期占用其中一个）
+IO_THREAD_WORKERS = 8
+
 
 class LogFilter(logging.Filter):
     """自定义日志过滤器 - 支持动态启用/禁用特定日志"""
@@ -76,8 +86,6 @@ class ConsoleCommandHandler:
 
     async def handle_console_input(self):
         """统一处理控制台输入"""
-        import asyncio
-        
         print("\n" + "="*60)
         print("控制台已就绪，可以输入命令")
         print("输入 #help 查看系统命令列表")
@@ -688,7 +696,8 @@ class MsmpQQBot(ServerEventListener):
                     self.config_manager.get_rcon_host(),
                     self.config_manager.get_rcon_port(),
                     self.config_manager.get_rcon_password(),
-                    self.logger
+                    self.logger,
+                    list_cache_ttl=self.config_manager.get_player_list_cache_ttl()
                 )
             
             if self.config_manager.is_msmp_enabled():
@@ -784,15 +793,10 @@ class MsmpQQBot(ServerEventListener):
             async def on_task_notify(task, message):
                 """任务通知回调 - 发送到QQ群"""
                 if self.qq_server and self.qq_server.current_connection:
-                    for group_id in self.qq_server.allowed_groups:
-                        try:
-                            await self.qq_server.send_group_message(
-                                self.qq_server.current_connection,
-                                group_id,
-                                message
-                            )
-                        except Exception as e:
-                            self.logger.error(f"发送定时通知失败: {e}")
+                    try:
+                        await self.qq_server.broadcast_to_all_groups(message)
+                    except Exception as e:
+                        self.logger.error(f"发送定时通知失败: {e}")
             
             self.scheduled_task_manager.set_start_callback(on_auto_start_task)
             self.scheduled_task_manager.set_stop_callback(on_auto_stop_task)
@@ -946,6 +950,9 @@ class MsmpQQBot(ServerEventListener):
         player_name = params.get('name', 'Unknown')
         self.logger.info(f"玩家加入: {player_name}")
         
+        if self.rcon_client:
+            self.rcon_client.invalidate_list_cache()
+        
         # 触发插件事件
         if self.plugin_manager:
             self.logger.debug(f"触发 player_join 事件给所有插件: {player_name}")
@@ -969,6 +976,9 @@ class MsmpQQBot(ServerEventListener):
         player_name = params.get('name', 'Unknown')
         self.logger.info(f"玩家离开: {player_name}")
         
+        if self.rcon_client:
+            self.rcon_client.invalidate_list_cache()
+        
         # 触发插件事件
         if self.plugin_manager:
             self.logger.debug(f"触发 player_leave 事件给所有插件: {player_name}")
@@ -1010,8 +1020,12 @@ def main():
     loop = None
     
     try:
-        loop = asyncio.new_event_loop()
+        loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
+        # 有界的默认线程池：连接、进程等待、日志写入等阻塞调用共用
+        loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=IO_THREAD_WORKERS, thread_name_prefix="bot-io")
+        )
         
         def signal_handler(signum, frame):
             print("\n收到停止信号，正在关闭...")
@@ -477,6 +477,7 @@ class PluginManager:
         self.command_handlers[command_name] = {
             "handler": handler,
             "names": names,
+            "match_names": frozenset(name.casefold() for name in names),
             "admin_only": admin_only,
             "description": description,
             "usage": usage,
@@ -556,6 +557,10 @@ class PluginManager:
         """
         try:
             if command_name in self.command_handlers:
+                # 派生的匹配键写入本地副本，不修改调用方传入的数据
+                updates = dict(updates)
+                if 'names' in updates:
+                    updates['match_names'] = frozenset(name.casefold() for name in updates['names'])
                 self.command_handlers[command_name].update(updates)
                 self.logger.debug(f"已更新命令: {command_name}")
                 return True
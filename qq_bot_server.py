@@ -5,17 +5,58 @@ import subprocess
 import os
 import sys
 import re
+import signal
+import socket
+import threading
 import psutil
 import asyncio
+import functools
+import hmac
+import itertools
+import queue
 from typing import List, Dict, Any, Optional
 import time
 from collections import deque
+from pathlib import Path
 from command_handler import CommandHandler, CommandHandlers
 from rcon_client import RCONClient
 from logging.handlers import RotatingFileHandler
 from custom_listener import CustomMessageListener
 from custom_command_handler import CustomCommandHandler
 
+# OneBot 请求 echo 序号(只需在连接内唯一)
+_echo_counter = itertools.count()
+
+# 服务器输出编码的探测顺序，优先保留中文(gb2312 是 gbk 的子集，无需单独尝试)
+_OUTPUT_ENCODINGS = ('gbk', 'utf-8')
+
+# 发送群消息的请求，与 json.dumps 的输出一致；依次代入 echo 序号、
+# 已序列化的群号和已序列化的消息体，广播时消息体只需序列化一次
+_GROUP_MSG_TEMPLATE = (
+    '{"action": "send_group_msg", "echo": "group_msg_%d", '
+    '"params": {"group_id": %s, "message": %s, "auto_escape": false}}'
+)
+
+# 日志触发任务队列容量与工作任务数
+LISTENER_QUEUE_SIZE = 2048
+LISTENER_WORKERS = 4
+
+# 服务器输出读取线程与事件循环之间的行队列容量，队列满时读取线程阻塞等待
+SERVER_OUTPUT_QUEUE_SIZE = 1024
+
+# 预编译的正则表达式
+_COLOR_CODE_RE = re.compile(r'§[0-9a-fk-or]')
+_COLOR_CODE_EXT_RE = re.compile(r'[§&][0-9a-fk-orA-FK-OR]')
+# 每行服务器输出都会检查，忽略大小写的正则匹配避免为每行生成 lower() 副本
+_SERVER_READY_RE = re.compile(r'done \(|server started', re.IGNORECASE)
+_SERVER_STOPPING_RE = re.compile(r'stopping server|正在保存世界', re.IGNORECASE)
+_CHUNK_MON_RE = re.compile(r'\[chunkmonitor\].*?\[区块监控\].*?世界', re.IGNORECASE)
+_TPS_FALLBACK_RES = (
+    re.compile(r'(\d+(?:\.\d+)?)', re.IGNORECASE),
+    re.compile(r'TPS[:\s]+(\d+(?:\.\d+)?)', re.IGNORECASE),
+    re.compile(r'(\d+(?:\.\d+)?)\s*(?:tps|TPS)', re.IGNORECASE),
+)
+
 class QQBotWebSocketServer:
     """
     QQ机器人WebSocket反向连接服务器
@@ -45,6 +86,8 @@ class QQBotWebSocketServer:
         self.rcon_client = rcon_client
         self.logger = logger
         self.access_token = access_token
+        # 预先构造鉴权头,握手时做常量时间比较
+        self._expected_auth = f"Bearer {access_token}".encode() if access_token else b""
         self.config_manager = config_manager
         self.connection_manager = connection_manager
         self.plugin_manager = plugin_manager
@@ -65,12 +108,40 @@ class QQBotWebSocketServer:
         # 标记是否为手动kill
         self._manual_kill = False
         
+        # 服务器输出编码(首次遇到非ASCII输出时探测后缓存编码名)
+        self._output_encoding = None
+        
+        # 日志时间戳缓存(同一秒内复用格式化结果)
+        self._ts_sec = -1
+        self._ts_str = ""
+        
+        # OneBot 事件分发表
+        self._post_type_dispatch = {
+            'message': self._handle_message_event,
+            'meta_event': self._handle_meta_event_message,
+            'request': self._handle_request_event,
+            'notice': self._handle_notice_event,
+        }
+        # 缺少 post_type 时按特征字段分发(按优先级排列)
+        self._implicit_dispatch = {
+            'echo': self._handle_api_response,
+            'meta_event_type': self._handle_meta_event_message,
+            'notice_type': self._handle_notice_event,
+            'message_type': self._handle_implicit_message_event,
+        }
+        
         max_logs = config_manager.get_max_server_logs() if config_manager else 100
         self.server_logs = deque(maxlen=max_logs)
+        
+        # 日志触发的异步处理（自定义监听、区块监控通知）走有界队列，由固定数量的工作任务消费
+        self._listener_queue = None
+        self._listener_workers = []
         self.logger.info(f"初始化服务器日志缓冲区 (最大容量: {max_logs}条)")
         
         # 日志文件相关
         self.server_log_file = None
+        self._log_queue = None
+        self._log_writer_task = None
         self.log_dir = "logs"
         self.log_file_path = os.path.join(self.log_dir, "mc_server.log")
         self.max_log_file_size = 10 * 1024 * 1024  # 10MB
@@ -101,11 +172,22 @@ class QQBotWebSocketServer:
                 self.logger.error(f"初始化自定义指令处理器失败: {e}")
                 self.custom_command_handler = None
 
+        # 缓存区块监控开关，每行日志都会读取，只在配置重载时刷新
+        self._refresh_chunk_monitor_settings()
+        
         # 注册配置重新加载回调
         if self.config_manager:
             self.config_manager.register_reload_callback(self._on_config_reload)
             self.logger.info("已注册配置重新加载回调")
     
+    def _refresh_chunk_monitor_settings(self):
+        """从配置读取区块监控相关开关和管理员列表"""
+        cm = self.config_manager
+        self._chunk_mon_enabled = bool(cm and cm.is_chunk_monitor_enabled())
+        self._chunk_mon_notify_admins = bool(cm and cm.should_notify_admins_on_chunk_monitor())
+        self._chunk_mon_notify_groups = bool(cm and cm.should_notify_groups_on_chunk_monitor())
+        self._chunk_mon_admins = tuple(cm.get_qq_admins()) if cm else ()
+    
     async def _on_config_reload(self, old_config: Dict, new_config: Dict):
         """配置重载时的回调函数
         
@@ -127,15 +209,7 @@ class QQBotWebSocketServer:
                 
                 # 通知所有群配置已更新
                 if self.current_connection and not self.current_connection.closed:
-                    for group_id in self.allowed_groups:
-                        try:
-                            await self.send_group_message(
-                                self.current_connection,
-                                group_id,
-                                "配置已重新加载，某些功能可能已更新"
-                            )
-                        except Exception as e:
-                            self.logger.debug(f"发送配置更新通知失败: {e}")
+                    await self._broadcast(self.current_connection, "配置已重新加载，某些功能可能已更新")
             
             # 检查最大日志行数是否变化
             old_max_logs = old_config.get('advanced', {}).get('max_server_logs', 100)
@@ -158,6 +232,8 @@ class QQBotWebSocketServer:
                 self._init_command_system()
                 self.logger.info("命令系统已重新初始化")
             
+            self._refresh_chunk_monitor_settings()
+            
             # 重新加载自定义监听规则
             if self.custom_listener:
                 self.custom_listener.reload_rules()
@@ -408,15 +484,18 @@ class QQBotWebSocketServer:
         Args:
             log_line: 单条MC服务器输出日志行
         """
-        import datetime
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        formatted_log = f"[{timestamp}] {log_line}"
+        now = time.time()
+        sec = int(now)
+        if sec != self._ts_sec:
+            self._ts_sec = sec
+            self._ts_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+        formatted_log = f"[{self._ts_str}] {log_line}"
         
         # 添加到 deque（自动限制大小，旧数据自动删除）
         self.server_logs.append(formatted_log)
         
         # 更新日志最后更新时间
-        self._last_log_update_time = time.time()
+        self._last_log_update_time = now
         
         # 写入到日志文件
         self._write_to_log_file(formatted_log)
@@ -424,21 +503,45 @@ class QQBotWebSocketServer:
         # 处理自定义监听规则（仅当连接活跃时）
         if self.custom_listener and self.current_connection and not self.current_connection.closed:
             try:
-                asyncio.create_task(self._process_server_log(log_line))
+                self._enqueue_listener_job(self._process_server_log, log_line)
             except Exception as e:
                 self.logger.error(f"创建日志处理任务失败: {e}")
         
         # 检查区块监控消息（仅当连接活跃时）
-        if (self.config_manager and 
-            self.config_manager.is_chunk_monitor_enabled() and
+        if (self._chunk_mon_enabled and
             self.current_connection and 
             not self.current_connection.closed):
             if self._is_chunk_monitor_message(log_line):
-                asyncio.create_task(self._send_chunk_monitor_notification(log_line))
+                self._enqueue_listener_job(self._send_chunk_monitor_notification, log_line)
         
         if self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug(f"存储服务器日志: {log_line[:100]}...")
     
+    def _enqueue_listener_job(self, handler, log_line: str):
+        """将日志处理任务放入有界队列，队列满时丢弃最旧的任务"""
+        if self._listener_queue is None:
+            return
+        
+        try:
+            self._listener_queue.put_nowait((handler, log_line))
+        except asyncio.QueueFull:
+            self._listener_queue.get_nowait()
+            self._listener_queue.task_done()
+            self._listener_queue.put_nowait((handler, log_line))
+            self.logger.debug("日志处理队列已满，丢弃最旧的任务")
+    
+    async def _listener_worker(self):
+        """日志处理工作任务"""
+        queue = self._listener_queue
+        while True:
+            handler, log_line = await queue.get()
+            try:
+                await handler(log_line)
+            except Exception as e:
+                self.logger.error(f"处理服务器日志任务失败: {e}", exc_info=True)
+            finally:
+                queue.task_done()
+    
     def get_recent_logs(self, lines: int = 20) -> List[str]:
         """获取最近的服务器日志
         
@@ -451,8 +554,12 @@ class QQBotWebSocketServer:
         if not self.server_logs:
             return ["暂无服务器日志"]
         
-        # deque 支持切片和迭代，返回最后 lines 条
-        return list(self.server_logs)[-lines:]
+        # deque 不支持切片；从尾部反向取 lines 条，只遍历需要的部分
+        if lines >= len(self.server_logs):
+            return list(self.server_logs)
+        recent = list(itertools.islice(reversed(self.server_logs), max(lines, 0)))
+        recent.reverse()
+        return recent
     
     def get_logs_info(self) -> str:
         """获取日志系统统计信息"""
@@ -469,32 +576,95 @@ class QQBotWebSocketServer:
         )
     
     def _write_to_log_file(self, log_line: str):
-        """写入日志到文件"""
-        if self.server_log_file and not self.server_log_file.closed:
-            try:
-                self.server_log_file.write(log_line + '\n')
-                self.server_log_file.flush()
-            except Exception as e:
-                self.logger.error(f"写入日志文件失败: {e}")
+        """将日志行放入写入队列,由 _log_writer 批量写入文件"""
+        if self._log_queue is None:
+            return
+        
+        try:
+            self._log_queue.put_nowait(log_line)
+        except asyncio.QueueFull:
+            # 队列已满时丢弃最旧的一行
+            self._log_queue.get_nowait()
+            self._log_queue.put_nowait(log_line)
 
-    def _close_log_file(self):
-        """关闭日志文件"""
-        if self.server_log_file and not self.server_log_file.closed:
+    async def _log_writer(self, log_queue: asyncio.Queue, log_file):
+        """日志写入任务 - 批量合并队列中的日志行,每次只写一次文件,约每秒刷新一次
+        
+        从队列取到 None 时写完此前的日志、关闭文件后退出。文件的写入、刷新和关闭
+        都由本任务依次提交到线程池，同一时刻只有一个线程操作文件。
+        队列和文件在创建时传入，任务开始运行前实例上的引用可能已被 _close_log_file 清空。
+        """
+        loop = asyncio.get_running_loop()
+        last_flush = time.monotonic()
+        dirty = False
+        closing = False
+        
+        while not closing:
             try:
-                self.server_log_file.close()
-                self.logger.info("服务器日志文件已关闭")
-            except Exception as e:
-                self.logger.error(f"关闭日志文件失败: {e}")
+                batch = [await asyncio.wait_for(log_queue.get(), timeout=1.0)]
+            except asyncio.TimeoutError:
+                batch = []
+            while batch and len(batch) < 256 and not log_queue.empty():
+                batch.append(log_queue.get_nowait())
+            
+            # None 是关闭标记，之后不会再有日志入队
+            if batch and batch[-1] is None:
+                batch.pop()
+                closing = True
+            
+            if batch:
+                try:
+                    await loop.run_in_executor(None, log_file.write, '\n'.join(batch) + '\n')
+                    dirty = True
+                except Exception as e:
+                    self.logger.error(f"写入日志文件失败: {e}")
+            
+            if dirty and not closing and time.monotonic() - last_flush >= 1.0:
+                try:
+                    await loop.run_in_executor(None, log_file.flush)
+                except Exception as e:
+                    self.logger.error(f"刷新日志文件失败: {e}")
+                last_flush = time.monotonic()
+                dirty = False
+        
+        await self._close_file(log_file)
+
+    async def _close_file(self, log_file):
+        """在线程池中关闭日志文件(关闭时会刷新缓冲区)"""
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, log_file.close)
+            self.logger.info("服务器日志文件已关闭")
+        except Exception as e:
+            self.logger.error(f"关闭日志文件失败: {e}")
+
+    async def _close_log_file(self):
+        """关闭日志文件 - 等待写入任务写完队列中的日志并关闭文件"""
+        task, self._log_writer_task = self._log_writer_task, None
+        log_queue, self._log_queue = self._log_queue, None
+        log_file, self.server_log_file = self.server_log_file, None
+        
+        if task is not None and not task.done():
+            # 队列已满时等待写入任务腾出位置
+            await log_queue.put(None)
+            await task
+        elif log_file is not None and not log_file.closed:
+            await self._close_file(log_file)
 
-    def _setup_log_file(self):
+    async def _setup_log_file(self):
         """设置日志文件"""
         try:
+            # 关闭上一次运行遗留的日志文件和写入任务
+            await self._close_log_file()
+            
             if os.path.exists(self.log_file_path):
                 file_size = os.path.getsize(self.log_file_path)
                 if file_size > self.max_log_file_size:
                     self._rotate_log_file()
             
-            self.server_log_file = open(self.log_file_path, 'a', encoding='utf-8', buffering=1)
+            self.server_log_file = open(self.log_file_path, 'a', encoding='utf-8', buffering=64 * 1024)
+            self._log_queue = asyncio.Queue(maxsize=4096)
+            self._log_writer_task = asyncio.create_task(
+                self._log_writer(self._log_queue, self.server_log_file))
             self.logger.info(f"服务器日志文件已打开: {self.log_file_path}")
             
         except Exception as e:
@@ -503,19 +673,23 @@ class QQBotWebSocketServer:
     def _rotate_log_file(self):
         """轮转日志文件"""
         try:
-            if os.path.exists(self.log_file_path):
-                oldest_backup = f"{self.log_file_path}.{self.backup_count}"
-                if os.path.exists(oldest_backup):
-                    os.remove(oldest_backup)
-                
-                for i in range(self.backup_count - 1, 0, -1):
+            # 列一次目录，只处理实际存在的备份
+            entries = set(os.listdir(self.log_dir))
+            base_name = os.path.basename(self.log_file_path)
+            if base_name in entries:
+                existing = [
+                    i for i in range(self.backup_count, 0, -1)
+                    if f"{base_name}.{i}" in entries
+                ]
+                for i in existing:
                     old_name = f"{self.log_file_path}.{i}"
-                    new_name = f"{self.log_file_path}.{i + 1}"
-                    if os.path.exists(old_name):
-                        os.rename(old_name, new_name)
+                    if i == self.backup_count:
+                        os.remove(old_name)
+                    else:
+                        os.replace(old_name, f"{self.log_file_path}.{i + 1}")
                 
                 backup_name = f"{self.log_file_path}.1"
-                os.rename(self.log_file_path, backup_name)
+                os.replace(self.log_file_path, backup_name)
                 
                 self.logger.info(f"已轮转日志文件: {self.log_file_path} -> {backup_name}")
                 
@@ -529,6 +703,12 @@ class QQBotWebSocketServer:
         if self.access_token:
             self.logger.info("WebSocket鉴权已启用")
         
+        self._listener_queue = asyncio.Queue(maxsize=LISTENER_QUEUE_SIZE)
+        self._listener_workers = [
+            asyncio.create_task(self._listener_worker())
+            for _ in range(LISTENER_WORKERS)
+        ]
+        
         self.server = await websockets.serve(
             self._handle_connection,
             "0.0.0.0",
@@ -539,6 +719,14 @@ class QQBotWebSocketServer:
     
     async def stop(self):
         """停止WebSocket服务器"""
+        if self.command_handlers:
+            self.command_handlers.close()
+        
+        for worker in self._listener_workers:
+            worker.cancel()
+        self._listener_workers = []
+        self._listener_queue = None
+        
         if self.server:
             self.server.close()
             await self.server.wait_closed()
@@ -551,7 +739,7 @@ class QQBotWebSocketServer:
         if self.access_token:
             headers = dict(websocket.request_headers)
             auth_header = headers.get('Authorization', '')
-            if auth_header != f"Bearer {self.access_token}":
+            if not hmac.compare_digest(auth_header.encode(), self._expected_auth):
                 self.logger.warning(f"鉴权失败,关闭连接: {client_ip}")
                 await websocket.close(1008, "Unauthorized")
                 return
@@ -564,11 +752,7 @@ class QQBotWebSocketServer:
             
             await self._send_meta_event(websocket, "connect")
             
-            try:
-                for group_id in self.allowed_groups:
-                    await self.send_group_message(websocket, group_id, "MSMP_QQBot 已连接成功!")
-            except Exception as e:
-                self.logger.error(f"发送连接成功通知失败: {e}")
+            await self._broadcast(websocket, "MSMP_QQBot 已连接成功!")
             
             try:
                 async for message in websocket:
@@ -606,38 +790,33 @@ class QQBotWebSocketServer:
     
     async def _handle_onebot_message(self, websocket, data: Dict[str, Any]):
         """处理OneBot协议消息"""
-        if 'post_type' not in data:
-            if 'echo' in data:
-                if self.logger.isEnabledFor(logging.DEBUG):
-                    self.logger.debug(f"收到API响应: {data.get('echo')}")
-                return
-            elif 'meta_event_type' in data:
-                await self._handle_meta_event_message(websocket, data)
-                return
-            elif 'notice_type' in data:
-                await self._handle_notice_event(websocket, data)
-                return
-            elif 'message_type' in data:
-                data['post_type'] = 'message'
-                await self._handle_message_event(websocket, data)
-                return
-            else:
-                self.logger.warning(f"无法识别的消息格式: {data}")
-                return
-        
         post_type = data.get('post_type')
         
-        if post_type == 'message':
-            await self._handle_message_event(websocket, data)
-        elif post_type == 'meta_event':
-            await self._handle_meta_event_message(websocket, data)
-        elif post_type == 'request':
-            await self._handle_request_event(websocket, data)
-        elif post_type == 'notice':
-            await self._handle_notice_event(websocket, data)
+        if post_type is None:
+            for key, handler in self._implicit_dispatch.items():
+                if key in data:
+                    await handler(websocket, data)
+                    return
+            
+            self.logger.warning(f"无法识别的消息格式: {data}")
+            return
+        
+        handler = self._post_type_dispatch.get(post_type)
+        if handler:
+            await handler(websocket, data)
         else:
             self.logger.warning(f"未知的post_type: {post_type}")
     
+    async def _handle_api_response(self, websocket, data: Dict[str, Any]):
+        """处理API调用响应"""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"收到API响应: {data.get('echo')}")
+    
+    async def _handle_implicit_message_event(self, websocket, data: Dict[str, Any]):
+        """处理缺少 post_type 的消息事件"""
+        data['post_type'] = 'message'
+        await self._handle_message_event(websocket, data)
+    
     async def _handle_message_event(self, websocket, data: Dict[str, Any]):
         """处理消息事件"""
         message_type = data.get('message_type', '')
@@ -674,147 +853,112 @@ class QQBotWebSocketServer:
                 except Exception as e:
                     self.logger.error(f"处理自定义指令失败: {e}", exc_info=True)
             
+            reply = functools.partial(self.send_group_message, websocket, group_id)
+            
             # ② 再检查 ! 开头的服务器命令
-            if raw_message.startswith('!'):
-                if not self.config_manager.is_admin(user_id):
-                    return
-                
-                server_command = raw_message[1:].strip()
-                if not server_command:
-                    await self.send_group_message(websocket, group_id, "命令不能为空")
-                    return
-                
-                try:
-                    result = await asyncio.wait_for(
-                        self._execute_server_command(server_command),
-                        timeout=30.0
-                    )
-                    
-                    if result:
-                        await self.send_group_message(websocket, group_id, f"命令执行结果:\n{result}")
-                    else:
-                        await self.send_group_message(websocket, group_id, "命令已发送,但无返回结果")
-                        
-                except asyncio.TimeoutError:
-                    await self.send_group_message(websocket, group_id, "命令执行超时(30秒),请检查服务器状态")
-                    self.logger.warning(f"服务器命令执行超时: {server_command}")
-                except Exception as e:
-                    await self.send_group_message(websocket, group_id, f"命令执行失败: {str(e)}")
-                    self.logger.error(f"执行服务器命令异常: {e}", exc_info=True)
-                
+            if raw_message[:1] == '!':
+                if self.config_manager.is_admin(user_id):
+                    await self._dispatch_raw_command(reply, raw_message[1:].strip())
                 return
             
             # ③ 最后检查普通命令（help, list, tps等）和插件命令
-            if self.command_handler:
-                try:
-                    parts = raw_message.split(maxsplit=1)
-                    base_command = parts[0].lower() if parts else ""
-                    command_args = parts[1] if len(parts) > 1 else ""
-                    
-                    if not base_command:
-                        return
-                    
-                    # 调用命令处理器，让它自动判断是插件命令还是内置命令
-                    result = await asyncio.wait_for(
-                        self.command_handler.handle_command(
-                            command_text=base_command,
-                            command_args=command_args,
-                            user_id=user_id,
-                            group_id=group_id,
-                            websocket=websocket,
-                            msmp_client=self.msmp_client,
-                            config_manager=self.config_manager, 
-                            rcon_client=self.rcon_client,
-                            plugin_manager=self.plugin_manager,
-                            connection_manager=self.connection_manager
-                        ),
-                        timeout=30.0
-                    )
-                    
-                    if result:
-                        await self.send_group_message(websocket, group_id, result)
-
-                except asyncio.TimeoutError:
-                    await self.send_group_message(websocket, group_id, "命令执行超时，请稍后重试")
-                    self.logger.warning(f"命令执行超时: {raw_message}")
-                except Exception as e:  
-                    self.logger.error(f"命令处理失败: {e}", exc_info=True)
-                    await self.send_group_message(websocket, group_id, f"命令出错: {str(e)}")
+            await self._dispatch_bot_command(websocket, reply, raw_message, user_id, group_id)
         
         elif message_type == 'private':
             if should_log:
                 self.logger.info(f"收到私聊消息 - 用户: {user_id}, 内容: {raw_message}")
             
-            # 私聊模式下，首先检查是否是管理员
-            is_admin = self.config_manager.is_admin(user_id)
+            reply = functools.partial(self.send_private_message, websocket, user_id)
             
             # ① 处理 ! 开头的服务器命令（仅管理员）
-            if raw_message.startswith('!'):
-                if not is_admin:
-                    return
-                
-                server_command = raw_message[1:].strip()
-                if not server_command:
-                    await self.send_private_message(websocket, user_id, "命令不能为空")
-                    return
-                
-                try:
-                    result = await asyncio.wait_for(
-                        self._execute_server_command(server_command),
-                        timeout=30.0
-                    )
-                    
-                    if result:
-                        await self.send_private_message(websocket, user_id, f"命令执行结果:\n{result}")
-                    else:
-                        await self.send_private_message(websocket, user_id, "命令已发送,但无返回结果")
-                        
-                except asyncio.TimeoutError:
-                    await self.send_private_message(websocket, user_id, "命令执行超时(30秒),请检查服务器状态")
-                    self.logger.warning(f"服务器命令执行超时: {server_command}")
-                except Exception as e:
-                    await self.send_private_message(websocket, user_id, f"命令执行失败: {str(e)}")
-                    self.logger.error(f"执行服务器命令异常: {e}", exc_info=True)
+            if raw_message[:1] == '!':
+                if self.config_manager.is_admin(user_id):
+                    await self._dispatch_raw_command(reply, raw_message[1:].strip())
+                return
+            
+            # ② 处理普通命令和插件命令（私聊时群组ID为0）
+            await self._dispatch_bot_command(websocket, reply, raw_message, user_id, 0, is_private=True)
+    
+    async def _dispatch_raw_command(self, reply, server_command: str):
+        """执行 ! 开头的服务器命令并回复结果
+        
+        Args:
+            reply: 回复函数(已绑定群号或用户ID的发送方法)
+            server_command: 去掉前缀后的服务器命令
+        """
+        if not server_command:
+            await reply("命令不能为空")
+            return
+        
+        try:
+            result = await asyncio.wait_for(
+                self._execute_server_command(server_command),
+                timeout=30.0
+            )
+            
+            if result:
+                await reply(f"命令执行结果:\n{result}")
+            else:
+                await reply("命令已发送,但无返回结果")
                 
+        except asyncio.TimeoutError:
+            await reply("命令执行超时(30秒),请检查服务器状态")
+            self.logger.warning(f"服务器命令执行超时: {server_command}")
+        except Exception as e:
+            await reply(f"命令执行失败: {str(e)}")
+            self.logger.error(f"执行服务器命令异常: {e}", exc_info=True)
+    
+    async def _dispatch_bot_command(self, websocket, reply, raw_message: str, user_id: int,
+                                    group_id: int, is_private: bool = False):
+        """交给命令处理器执行普通命令和插件命令并回复结果
+        
+        Args:
+            websocket: 当前连接
+            reply: 回复函数(已绑定群号或用户ID的发送方法)
+            raw_message: 原始消息
+            user_id: 发送者QQ号
+            group_id: 群号(私聊为0)
+            is_private: 是否为私聊
+        """
+        if not self.command_handler:
+            return
+        
+        try:
+            parts = raw_message.split(maxsplit=1)
+            base_command = parts[0].casefold() if parts else ""
+            command_args = parts[1] if len(parts) > 1 else ""
+            
+            if not base_command:
                 return
             
-            # ② 处理普通命令和插件命令（私聊）
-            if self.command_handler:
-                try:
-                    parts = raw_message.split(maxsplit=1)
-                    base_command = parts[0].lower() if parts else ""
-                    command_args = parts[1] if len(parts) > 1 else ""
-                    
-                    if not base_command:
-                        return
-                    
-                    # 调用命令处理器，处理插件命令和内置命令
-                    result = await asyncio.wait_for(
-                        self.command_handler.handle_command(
-                            command_text=base_command,
-                            command_args=command_args,
-                            user_id=user_id,
-                            group_id=0,  # 私聊时群组ID为0
-                            websocket=websocket,
-                            msmp_client=self.msmp_client,
-                            config_manager=self.config_manager,
-                            rcon_client=self.rcon_client,
-                            plugin_manager=self.plugin_manager,
-                            connection_manager=self.connection_manager,
-                            is_private=True  # 标记为私聊模式
-                        ),
-                        timeout=30.0
-                    )
-                    
-                    if result is not None:
-                        await self.send_private_message(websocket, user_id, result)
-                        
-                except asyncio.TimeoutError:
-                    await self.send_private_message(websocket, user_id, "命令执行超时,请稍后重试")
-                    self.logger.warning(f"命令执行超时: {raw_message}")
-                except Exception as e:
-                    self.logger.error(f"命令处理失败: {e}", exc_info=True)
-                    await self.send_private_message(websocket, user_id, f"命令执行出错: {str(e)}")
+            # 调用命令处理器，让它自动判断是插件命令还是内置命令
+            result = await asyncio.wait_for(
+                self.command_handler.handle_command(
+                    command_text=base_command,
+                    command_args=command_args,
+                    user_id=user_id,
+                    group_id=group_id,
+                    websocket=websocket,
+                    msmp_client=self.msmp_client,
+                    config_manager=self.config_manager,
+                    rcon_client=self.rcon_client,
+                    plugin_manager=self.plugin_manager,
+                    connection_manager=self.connection_manager,
+                    is_private=is_private
+                ),
+                timeout=30.0
+            )
+            
+            # 私聊时空字符串结果也会回复，群聊只回复非空结果
+            if result or (is_private and result is not None):
+                await reply(result)
+                
+        except asyncio.TimeoutError:
+            await reply("命令执行超时,请稍后重试" if is_private else "命令执行超时，请稍后重试")
+            self.logger.warning(f"命令执行超时: {raw_message}")
+        except Exception as e:
+            self.logger.error(f"命令处理失败: {e}", exc_info=True)
+            await reply(f"{'命令执行出错' if is_private else '命令出错'}: {str(e)}")
     
     async def _execute_server_command(self, command: str) -> Optional[str]:
         """执行Minecraft服务器命令并返回结果"""
@@ -829,7 +973,7 @@ class QQBotWebSocketServer:
                     result = self.rcon_client.execute_command(command)
                     
                     if result:
-                        cleaned = re.sub(r'§[0-9a-fk-or]', '', result).strip()
+                        cleaned = _COLOR_CODE_RE.sub('', result).strip()
                         return cleaned if cleaned else "命令执行成功(无输出)"
                     else:
                         return "命令执行成功(无输出)"
@@ -900,9 +1044,6 @@ class QQBotWebSocketServer:
     async def _send_meta_event(self, websocket, event_type: str):
         """发送元事件"""
         try:
-            if websocket.closed:
-                return
-            
             meta_event = {
                 "post_type": "meta_event",
                 "meta_event_type": "lifecycle",
@@ -911,6 +1052,8 @@ class QQBotWebSocketServer:
             }
             
             await websocket.send(json.dumps(meta_event))
+        except websockets.exceptions.ConnectionClosed:
+            return
         except Exception as e:
             if self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug(f"发送元事件失败: {e}")
@@ -918,43 +1061,29 @@ class QQBotWebSocketServer:
     async def send_group_message(self, websocket, group_id: int, message: str):
         """发送群消息"""
         try:
-            if not websocket or websocket.closed:
+            if not websocket:
                 self.logger.warning("无法发送消息:WebSocket连接已关闭")
                 return
             
-            max_length = self.config_manager.get_max_message_length() if self.config_manager else 500
-            if len(message) > max_length:
-                message = message[:max_length] + "..."
-                
-            request = {
-                "action": "send_group_msg",
-                "echo": f"group_msg_{int(time.time() * 1000)}",
-                "params": {
-                    "group_id": group_id,
-                    "message": message,
-                    "auto_escape": False
-                }
-            }
-            
-            await websocket.send(json.dumps(request))
+            message_json = json.dumps(self._truncate_message(message))
+            await websocket.send(self._group_message_payload(group_id, message_json))
             
+        except websockets.exceptions.ConnectionClosed:
+            self.logger.warning("无法发送消息:WebSocket连接已关闭")
         except Exception as e:
             self.logger.error(f"发送群消息失败: {e}", exc_info=True)
     
     async def send_private_message(self, websocket, user_id: int, message: str):
         """发送私聊消息"""
         try:
-            if not websocket or websocket.closed:
+            if not websocket:
                 self.logger.warning("无法发送消息:WebSocket连接已关闭")
                 return
             
-            max_length = self.config_manager.get_max_message_length() if self.config_manager else 500
-            if len(message) > max_length:
-                message = message[:max_length] + "..."
-                
+            message = self._truncate_message(message)
             request = {
                 "action": "send_private_msg",
-                "echo": f"private_msg_{int(time.time() * 1000)}",
+                "echo": f"private_msg_{next(_echo_counter)}",
                 "params": {
                     "user_id": user_id,
                     "message": message,
@@ -964,17 +1093,86 @@ class QQBotWebSocketServer:
             
             await websocket.send(json.dumps(request))
             
+        except websockets.exceptions.ConnectionClosed:
+            self.logger.warning("无法发送消息:WebSocket连接已关闭")
         except Exception as e:
             self.logger.error(f"发送私聊消息失败: {e}", exc_info=True)
     
     async def broadcast_to_all_groups(self, message: str):
         """广播消息到所有配置的QQ群"""
-        if not self.current_connection or self.current_connection.closed:
+        if not self.current_connection:
             self.logger.warning("无法发送群消息:QQ机器人未连接")
             return
         
-        for group_id in self.allowed_groups:
-            await self.send_group_message(self.current_connection, group_id, message)
+        await self._broadcast(self.current_connection, message)
+    
+    async def _broadcast(self, websocket, message: str):
+        """并发向所有配置的QQ群发送同一条消息(消息体只截断和序列化一次)"""
+        if not websocket:
+            self.logger.warning("无法发送消息:WebSocket连接已关闭")
+            return
+        
+        # 快照群列表，配置热重载替换列表时不影响本次广播
+        groups = tuple(self.allowed_groups)
+        if not groups:
+            return
+        
+        # 后端支持批量群发时只发送一个请求
+        if self.config_manager and self.config_manager.is_backend_batch_send_enabled():
+            await self._send_group_message_batch(websocket, groups, message)
+            return
+        
+        message_json = json.dumps(self._truncate_message(message))
+        await asyncio.gather(*(
+            self._send_group_payload(websocket, self._group_message_payload(group_id, message_json))
+            for group_id in groups
+        ), return_exceptions=True)
+    
+    def _truncate_message(self, message: str) -> str:
+        """按配置的最大消息长度截断消息"""
+        max_length = self.config_manager.get_max_message_length() if self.config_manager else 500
+        if len(message) > max_length:
+            message = message[:max_length] + "..."
+        return message
+    
+    @staticmethod
+    def _group_message_payload(group_id: int, message_json: str) -> str:
+        """构造发送群消息的请求文本(message_json 为已截断并序列化的消息体)"""
+        return _GROUP_MSG_TEMPLATE % (next(_echo_counter), json.dumps(group_id), message_json)
+    
+    async def _send_group_payload(self, websocket, payload: str):
+        """发送一条已序列化的群消息请求"""
+        try:
+            await websocket.send(payload)
+        except websockets.exceptions.ConnectionClosed:
+            self.logger.warning("无法发送消息:WebSocket连接已关闭")
+        except Exception as e:
+            self.logger.error(f"发送群消息失败: {e}", exc_info=True)
+    
+    async def _send_group_message_batch(self, websocket, group_ids: List[int], message: str):
+        """通过一次批量请求向多个群发送同一条消息(需后端支持)"""
+        try:
+            if not websocket:
+                self.logger.warning("无法发送消息:WebSocket连接已关闭")
+                return
+            
+            message = self._truncate_message(message)
+            request = {
+                "action": "send_group_msg_batch",
+                "echo": f"group_msg_batch_{next(_echo_counter)}",
+                "params": {
+                    "group_ids": list(group_ids),
+                    "message": message,
+                    "auto_escape": False
+                }
+            }
+            
+            await websocket.send(json.dumps(request))
+            
+        except websockets.exceptions.ConnectionClosed:
+            self.logger.warning("无法发送消息:WebSocket连接已关闭")
+        except Exception as e:
+            self.logger.error(f"批量发送群消息失败: {e}", exc_info=True)
     
     def is_connected(self) -> bool:
         """检查是否有活动连接"""
@@ -1007,7 +1205,7 @@ class QQBotWebSocketServer:
                 try:
                     if rcon_connected:
                         player_info = self.rcon_client.get_player_list()
-                        player_count = player_info.current_players
+                        player_count = player_info.current_players if player_info else 0
                         if self.logger.isEnabledFor(logging.DEBUG):
                             self.logger.debug(f"通过RCON获取玩家数: {player_count}")
                     elif msmp_connected:
@@ -1035,7 +1233,7 @@ class QQBotWebSocketServer:
                         
                         if tps_result:
                             # 清理颜色代码
-                            cleaned_tps = re.sub(r'[§&][0-9a-fk-orA-FK-OR]', '', tps_result).strip()
+                            cleaned_tps = _COLOR_CODE_EXT_RE.sub('', tps_result).strip()
                             
                             # 使用与handle_tps相同的正则提取逻辑
                             tps_value = self._extract_tps_from_text(cleaned_tps)
@@ -1112,15 +1310,8 @@ class QQBotWebSocketServer:
                     return None
             else:
                 # 尝试备用正则
-                fallback_patterns = [
-                    r'(\d+(?:\.\d+)?)',
-                    r'TPS[:\s]+(\d+(?:\.\d+)?)',
-                    r'(\d+(?:\.\d+)?)\s*(?:tps|TPS)',
-                ]
-                
-                for fallback_regex in fallback_patterns:
+                for fallback_pattern in _TPS_FALLBACK_RES:
                     try:
-                        fallback_pattern = re.compile(fallback_regex, re.IGNORECASE)
                         fallback_match = fallback_pattern.search(text)
                         if fallback_match:
                             fallback_tps_str = fallback_match.group(1)
@@ -1140,7 +1331,12 @@ class QQBotWebSocketServer:
 
     def _is_chunk_monitor_message(self, log_line: str) -> bool:
         """检查是否是区块监控消息"""
-        return bool(re.search(r'\[chunkmonitor\].*?\[区块监控\].*?世界', log_line, re.IGNORECASE))
+        # 先用与大小写无关的中文字面量快速排除绝大多数日志行，命中后再用正则确认顺序
+        if '[区块监控]' not in log_line or '世界' not in log_line:
+            return False
+        if '[chunkmonitor]' not in log_line.lower():
+            return False
+        return _CHUNK_MON_RE.search(log_line) is not None
     
     async def _send_chunk_monitor_notification(self, log_line: str):
         """发送区块监控通知到QQ"""
@@ -1149,29 +1345,23 @@ class QQBotWebSocketServer:
                 self.logger.warning("无法发送区块监控通知:QQ机器人未连接")
                 return
             
-            cleaned_message = re.sub(r'§[0-9a-fk-or]', '', log_line).strip()
+            cleaned_message = _COLOR_CODE_RE.sub('', log_line).strip()
+            message = f"区块监控告警:\n{cleaned_message}"
             
-            if self.config_manager.should_notify_admins_on_chunk_monitor():
-                for admin_id in self.config_manager.get_qq_admins():
-                    try:
-                        await self.send_private_message(
-                            self.current_connection,
-                            admin_id,
-                            f"区块监控告警:\n{cleaned_message}"
-                        )
-                    except Exception as e:
-                        self.logger.error(f"发送管理员私聊通知失败: {e}")
+            sends = []
+            if self._chunk_mon_notify_admins:
+                sends.extend(
+                    self.send_private_message(self.current_connection, admin_id, message)
+                    for admin_id in self._chunk_mon_admins
+                )
             
-            if self.config_manager.should_notify_groups_on_chunk_monitor():
-                for group_id in self.allowed_groups:
-                    try:
-                        await self.send_group_message(
-                            self.current_connection,
-                            group_id,
-                            f"区块监控告警:\n{cleaned_message}"
-                        )
-                    except Exception as e:
-                        self.logger.error(f"发送群通知失败: {e}")
+            if self._chunk_mon_notify_groups:
+                sends.append(self._broadcast(self.current_connection, message))
+            
+            if sends:
+                for result in await asyncio.gather(*sends, return_exceptions=True):
+                    if isinstance(result, Exception):
+                        self.logger.error(f"发送区块监控通知失败: {result}")
             
             self.logger.info(f"已发送区块监控通知: {log_line[:100]}")
             
@@ -1260,8 +1450,6 @@ class QQBotWebSocketServer:
     async def _check_port_availability(self):
         """检查MSMP和RCON端口是否被占用"""
         try:
-            import socket
-            
             # 检查MSMP端口
             if self.config_manager.is_msmp_enabled():
                 msmp_port = self.config_manager.get_msmp_port()
@@ -1309,8 +1497,6 @@ class QQBotWebSocketServer:
             return
         
         try:
-            import subprocess
-            
             # 使用 netstat 查找占用端口的进程
             result = subprocess.run(
                 ['netstat', '-ano', '-p', 'TCP'],
@@ -1345,7 +1531,7 @@ class QQBotWebSocketServer:
             # 在启动前检查并清理可能的文件锁
             await self._check_and_clean_file_locks()
             
-            self._setup_log_file()
+            await self._setup_log_file()
             
             start_script = self.config_manager.get_server_start_script()
             working_dir = self.config_manager.get_server_working_directory()
@@ -1366,6 +1552,9 @@ class QQBotWebSocketServer:
                         await self.send_private_message(websocket, private_user_id, error_msg)
                 return
             
+            # 新进程重新探测输出编码
+            self._output_encoding = None
+            
             creationflags = 0
             if os.name == 'nt':
                 creationflags = subprocess.CREATE_NEW_PROCESS_GROUP
@@ -1393,7 +1582,7 @@ class QQBotWebSocketServer:
                     elif private_user_id:
                         await self.send_private_message(websocket, private_user_id, error_msg)
                 self.server_process = None
-                self._close_log_file()
+                await self._close_log_file()
                 return
             
             # 重置停止标志
@@ -1424,7 +1613,7 @@ class QQBotWebSocketServer:
                     await self.send_private_message(websocket, private_user_id, error_msg)
             
             self.server_process = None
-            self._close_log_file()
+            await self._close_log_file()
             raise
 
     async def _monitor_log_idle(self):
@@ -1465,21 +1654,15 @@ class QQBotWebSocketServer:
                     # 发送通知消息（这里发送一次，_monitor_server_process 中就不要再发送了）
                     if self.current_connection and not self.current_connection.closed:
                         msg = f"检测到服务器日志已停止更新({int(time_since_last_log)}秒),正在自动重启..."
-                        for group_id in self.allowed_groups:
-                            try:
-                                await self.send_group_message(self.current_connection, group_id, msg)
-                            except Exception as e:
-                                self.logger.debug(f"发送通知失败: {e}")
+                        await self._broadcast(self.current_connection, msg)
                     
                     # 杀死进程
                     try:
                         if self.server_process and self.server_process.poll() is None:
-                            import signal
                             pid = self.server_process.pid
                             self.logger.info(f"因日志空闲,强制终止进程 {pid}")
                             
                             if os.name == 'nt':
-                                import subprocess
                                 try:
                                     subprocess.run(
                                         ['taskkill', '/F', '/T', '/PID', str(pid)],
@@ -1506,19 +1689,56 @@ class QQBotWebSocketServer:
             self.logger.error(f"日志空闲监控异常: {e}", exc_info=True)
 
     def _decode_line(self, line_bytes: bytes) -> str:
-        """尝试用多种编码解码一行输出,优先保留中文"""
+        """解码一行输出,首次遇到非ASCII内容时探测编码并缓存编码名
+        
+        每行独立解码，某一行末尾不完整的多字节字符不会影响下一行。
+        """
         if isinstance(line_bytes, str):
             return line_bytes
         
-        encodings = ['gbk', 'gb2312', 'utf-8', 'utf-16', 'latin-1']
+        if self._output_encoding is not None:
+            return line_bytes.decode(self._output_encoding, 'replace')
         
-        for encoding in encodings:
+        # 纯ASCII行无法区分编码,直接解码且不锁定
+        if line_bytes.isascii():
+            return line_bytes.decode('ascii')
+        
+        for encoding in _OUTPUT_ENCODINGS:
             try:
-                return line_bytes.decode(encoding)
-            except (UnicodeDecodeError, LookupError):
+                line_str = line_bytes.decode(encoding)
+            except UnicodeDecodeError:
                 continue
+            
+            self._output_encoding = encoding
+            self.logger.info(f"检测到服务器输出编码: {encoding}")
+            return line_str
+        
+        return line_bytes.decode('latin-1')
+
+    def _pump_server_output(self, stdout, loop: asyncio.AbstractEventLoop, lines: queue.Queue,
+                            ready: asyncio.Event, notified: threading.Event):
+        """后台线程: 阻塞读取服务器标准输出放入行队列,读到EOF时放入None
         
-        return line_bytes.decode('utf-8', errors='replace')
+        队列满时阻塞等待事件循环消费，由服务器端管道缓冲承担背压；
+        事件循环取走上一批之前只唤醒一次，不再每行都跨线程调度。
+        """
+        def put(item):
+            lines.put(item)
+            if not notified.is_set():
+                notified.set()
+                loop.call_soon_threadsafe(ready.set)
+        
+        try:
+            for line_bytes in iter(stdout.readline, b''):
+                put(line_bytes)
+        except Exception as e:
+            self.logger.debug(f"读取服务器输出线程结束: {e}")
+        finally:
+            try:
+                put(None)
+            except RuntimeError:
+                # 事件循环已关闭
+                pass
 
     async def _read_server_output(self):
         """读取服务器输出并在控制台显示,同时存储日志"""
@@ -1531,114 +1751,85 @@ class QQBotWebSocketServer:
             self.logger.info("Minecraft服务器日志 (您仍可在服务器窗口输入命令)")
             self.logger.info("=" * 60)
             
-            empty_line_count = 0
-            max_empty_lines = 10  # 连续空行的最大次数
-            
-            while self.server_process and not self.server_stopping:
-                # 检查进程是否已结束
-                if self.server_process.poll() is not None:
-                    self.logger.info("检测到服务器进程已结束，继续采集剩余输出...")
-                    # 进程结束后继续读取剩余输出
-                    break
-
-                try:
-                    # 使用非阻塞方式读取输出
-                    line_bytes = await asyncio.get_event_loop().run_in_executor(
-                        None, 
-                        lambda: self.server_process.stdout.readline() if self.server_process else b''
-                    )
-                    
-                    if line_bytes:
-                        empty_line_count = 0  # 重置空行计数
-                        try:
-                            line_str = self._decode_line(line_bytes)
-                        except Exception as e:
-                            self.logger.warning(f"解码失败: {e}")
-                            continue
-                        
-                        line_str = line_str.strip()
-                        
-                        if line_str:
-                            print(f"[MC Server] {line_str}")
-                            
-                            # 始终存储日志，即使正在停止
-                            self._store_server_log(line_str)
-                            
-                            if self._is_server_ready(line_str):
-                                self.logger.info("检测到服务器启动完成")
-                                asyncio.create_task(self._send_server_started_notification())
-                                
-                            # 检查服务器关闭相关的日志
-                            if self._is_server_stopping(line_str):
-                                self.logger.info("检测到服务器正在关闭")
-                    else:
-                        # 空行处理
-                        empty_line_count += 1
-                        if empty_line_count >= max_empty_lines:
-                            # 检查进程是否真的结束了
-                            if self.server_process.poll() is not None:
-                                self.logger.info("进程已结束，停止日志采集")
-                                break
-                            else:
-                                # 进程还在运行，只是没有输出，重置计数继续等待
-                                empty_line_count = 0
-                        
-                        # 没有数据时短暂休眠，避免CPU占用过高
-                        await asyncio.sleep(0.1)
-                        
-                except Exception as e:
-                    self.logger.error(f"读取输出行失败: {e}")
-                    await asyncio.sleep(0.1)
-                    continue
-            
-            # 进程结束后，继续读取所有剩余输出
-            remaining_output_read = False
+            # 由专用线程阻塞读取标准输出,避免每行都占用一次默认线程池调度;
+            # 事件循环每次被唤醒后成批取出已读到的行
+            lines = queue.Queue(maxsize=SERVER_OUTPUT_QUEUE_SIZE)
+            ready = asyncio.Event()
+            notified = threading.Event()
+            threading.Thread(
+                target=self._pump_server_output,
+                args=(self.server_process.stdout, asyncio.get_running_loop(), lines, ready, notified),
+                daemon=True,
+                name="ServerOutputReader"
+            ).start()
             
             while True:
+                # 先清除唤醒标记再取队列，之后放入的行会再次唤醒
+                ready.clear()
+                notified.clear()
+                batch = []
                 try:
-                    line_bytes = await asyncio.get_event_loop().run_in_executor(
-                        None, 
-                        lambda: self.server_process.stdout.readline() if self.server_process else b''
-                    )
-                    
-                    if not line_bytes:
-                        break
-                        
-                    try:
-                        line_str = self._decode_line(line_bytes).strip()
-                        if line_str:
-                            print(f"[MC Server] {line_str}")
-                            self._store_server_log(line_str)
-                            remaining_output_read = True
-                    except Exception as e:
-                        self.logger.debug(f"解码剩余输出失败: {e}")
-                        
-                except Exception as e:
-                    self.logger.debug(f"读取剩余输出时出错: {e}")
+                    while True:
+                        batch.append(lines.get_nowait())
+                except queue.Empty:
+                    pass
+                
+                if not batch:
+                    await ready.wait()
+                    continue
+                
+                if not self._process_output_batch(batch):
                     break
-            
-            if remaining_output_read:
-                self.logger.debug("服务器剩余输出已读取")
+                # 输出持续不断时也让出事件循环
+                await asyncio.sleep(0)
             
             self.logger.info("服务器输出采集结束")
                     
         except Exception as e:
             self.logger.error(f"读取服务器输出失败: {e}", exc_info=True)
 
+    def _process_output_batch(self, batch: list) -> bool:
+        """处理一批服务器输出行，遇到EOF标记(None)时返回False"""
+        for line_bytes in batch:
+            if line_bytes is None:
+                return False
+            
+            # 在字节上去除首尾空白，空行无需解码
+            line_bytes = line_bytes.strip()
+            if not line_bytes:
+                continue
+            
+            try:
+                line_str = self._decode_line(line_bytes)
+            except Exception as e:
+                self.logger.warning(f"解码失败: {e}")
+                continue
+            
+            print(f"[MC Server] {line_str}")
+            
+            # 始终存储日志，即使正在停止
+            self._store_server_log(line_str)
+            
+            if self.server_stopping:
+                continue
+            
+            if self._is_server_ready(line_str):
+                self.logger.info("检测到服务器启动完成")
+                asyncio.create_task(self._send_server_started_notification())
+                
+            # 检查服务器关闭相关的日志
+            if self._is_server_stopping(line_str):
+                self.logger.info("检测到服务器正在关闭")
+        
+        return True
+
     def _is_server_stopping(self, line: str) -> bool:
         """检查服务器是否正在关闭"""
-        line_lower = line.lower()
-        stopping_keywords = [
-            'stopping server',
-            '正在保存世界'
-        ]
-        return any(keyword in line_lower for keyword in stopping_keywords)
+        return _SERVER_STOPPING_RE.search(line) is not None
 
     def _is_server_ready(self, line: str) -> bool:
         """检查服务器是否启动完成"""
-        line_lower = line.lower()
-        ready_keywords = ['done (', 'server started']
-        return any(keyword in line_lower for keyword in ready_keywords)
+        return _SERVER_READY_RE.search(line) is not None
 
     async def _send_server_started_notification(self):
         """发送服务器启动成功通知"""
@@ -1646,8 +1837,7 @@ class QQBotWebSocketServer:
             if self.current_connection and not self.current_connection.closed:
                 message = "Minecraft服务器启动完成!"
                 
-                for group_id in self.allowed_groups:
-                    await self.send_group_message(self.current_connection, group_id, message)
+                await self._broadcast(self.current_connection, message)
                 
                 self.logger.info("服务器启动完成")
 
@@ -1669,7 +1859,7 @@ class QQBotWebSocketServer:
                     
                     
                     self.logger.info("开始连接MSMP和RCON服务...")
-                    results = await self.connection_manager.connect_after_server_start(delay=5)
+                    results = await self.connection_manager.connect_after_server_start()
                     
                     # 记录连接结果
                     connected_services = []
@@ -1683,12 +1873,10 @@ class QQBotWebSocketServer:
                         
                         # 发送连接成功通知
                         if self.current_connection and not self.current_connection.closed:
-                            for group_id in self.allowed_groups:
-                                await self.send_group_message(
-                                    self.current_connection, 
-                                    group_id, 
-                                    f"已连接到: {', '.join(connected_services)}"
-                                )
+                            await self._broadcast(
+                                self.current_connection,
+                                f"已连接到: {', '.join(connected_services)}"
+                            )
                     else:
                         self.logger.warning("自动连接失败，将在需要时重试")
                 
@@ -1719,7 +1907,7 @@ class QQBotWebSocketServer:
                 if hasattr(self, 'command_handlers'):
                     await self.command_handlers._close_all_connections()
                 else:
-                    self._close_log_file()
+                    await self._close_log_file()
                 
                 self.server_process = None
                 return  # 退出,不进行任何重启
@@ -1759,11 +1947,10 @@ class QQBotWebSocketServer:
                         failed_msg = "服务器自动重启失败,将在{}秒后重新尝试...".format(
                             self.config_manager.get_crash_restart_delay()
                         )
-                        for group_id in self.allowed_groups:
-                            await self.send_group_message(self.current_connection, group_id, failed_msg)
+                        await self._broadcast(self.current_connection, failed_msg)
                     
                     self.server_process = None
-                    self._close_log_file()
+                    await self._close_log_file()
                 
                 return  # 返回,避免执行后续的异常停止逻辑
             
@@ -1781,8 +1968,7 @@ class QQBotWebSocketServer:
                 # 发送通知消息
                 if self.current_connection and not self.current_connection.closed:
                     crash_msg = "检测到服务器异常停止,正在自动重启..."
-                    for group_id in self.allowed_groups:
-                        await self.send_group_message(self.current_connection, group_id, crash_msg)
+                    await self._broadcast(self.current_connection, crash_msg)
                 
                 # 等待重启延迟
                 delay = self.config_manager.get_crash_restart_delay()
@@ -1811,11 +1997,10 @@ class QQBotWebSocketServer:
                         failed_msg = "服务器自动重启失败,将在{}秒后重新尝试...".format(
                             self.config_manager.get_crash_restart_delay()
                         )
-                        for group_id in self.allowed_groups:
-                            await self.send_group_message(self.current_connection, group_id, failed_msg)
+                        await self._broadcast(self.current_connection, failed_msg)
                     
                     self.server_process = None
-                    self._close_log_file()
+                    await self._close_log_file()
                 
                 return  # 返回,避免执行后续的正常停止逻辑
             
@@ -1824,7 +2009,7 @@ class QQBotWebSocketServer:
             if hasattr(self, 'command_handlers'):
                 await self.command_handlers._close_all_connections()
             else:
-                self._close_log_file()
+                await self._close_log_file()
             
             if return_code == 0:
                 message = "服务器正常关闭"
@@ -1832,15 +2017,14 @@ class QQBotWebSocketServer:
                 message = f"服务器异常关闭,返回码: {return_code}"
             
             if self.current_connection and not self.current_connection.closed:
-                for group_id in self.allowed_groups:
-                    await self.send_group_message(self.current_connection, group_id, message)
+                await self._broadcast(self.current_connection, message)
             
             self.server_process = None
             
         except Exception as e:
             self.logger.error(f"监控服务器进程失败: {e}", exc_info=True)
             self.server_process = None
-            self._close_log_file()
+            await self._close_log_file()
 
     async def _send_crash_report_file(self, websocket, user_id: int, group_id: int, file_path: str, is_private: bool = False):
         """直接发送崩溃报告文件到群或私聊"""
@@ -1849,10 +2033,6 @@ class QQBotWebSocketServer:
                 self.logger.warning("无法发送文件:WebSocket连接已关闭")
                 return
             
-            from pathlib import Path
-            import json
-            import time
-            
             file_obj = Path(file_path)
             
             if not file_obj.exists():
@@ -1,22 +1,62 @@
+import select
 import socket
 import struct
 import logging
+import time
 import re
 from typing import Optional, List
-from dataclasses import dataclass
 
-@dataclass
+# RCON 数据包头部格式（预编译，避免每次按格式字符串查找）
+_PACKET_HEADER = struct.Struct('<iii')  # Length + ID + Type
+_PACKET_LENGTH = struct.Struct('<i')
+_PACKET_ID_TYPE = struct.Struct('<ii')
+# TCP 保活参数: 空闲30秒后开始探测，每10秒一次，连续3次无响应判定断开
+_KEEPALIVE_IDLE = 30
+_KEEPALIVE_INTERVAL = 10
+_KEEPALIVE_COUNT = 3
+
+# 高频命令的预编码结果
+_ENCODED_COMMANDS = {'list': b'list', 'stop': b'stop'}
+
+# list 响应解析用的预编译正则
+_COLOR_RE = re.compile(r'[Â§&][0-9a-fk-orA-FK-OR]')
+# 在线人数的五种格式，按顺序逐个尝试，先命中的格式优先(而不是文本中靠前的匹配)
+# 合并为一个分支正则会让靠前出现的通用格式抢先命中，因此保持分开
+_PAT_PLAYER_COUNTS = (
+    re.compile(r'There are (\d+) of a max of (\d+) players online', re.IGNORECASE),  # 模式1: 英文标准格式
+    re.compile(r'There are (\d+)/(\d+) players online', re.IGNORECASE),             # 模式2: 英文变体格式
+    re.compile(r'当前有\s*(\d+)\s*个玩家在线.*?最多\s*(\d+)\s*人'),                   # 模式3: 中文格式
+    re.compile(r'玩家在线\s*(\d+)/(\d+)'),                                            # 模式4: 中文简写格式
+    re.compile(r'(\d+)\s*(?:of|/)\s*(\d+)'),                                         # 模式5: 通用格式
+)
+# 分类格式 "服主在线: xxx" / "default: yyy"
+_PAT_CATEGORY = re.compile(r'(?:服主在线|default|在线玩家|players)[:：]\s*([^\n:：]+)')
+# 无逗号时的玩家名称分隔符
+_PAT_SPLIT = re.compile(r'\s{2,}|,|;|，|；|\n')
+# 清理后不是玩家名称的残留片段
+_REJECT_TOKENS = frozenset({':', '：', 'online', '在线'})
+# 玩家名称清理用的删除表：空白字符与常见符号（保留中文等非 ASCII 名称字符）
+_NAME_DELETE_TABLE = str.maketrans('', '', '[](){}<>"\'`~!@#$%^&*|\\/?' + ''.join(
+    chr(i) for i in range(0x3001) if chr(i).isspace()
+))
 class PlayerListInfo:
     """玩家列表信息"""
-    current_players: int = 0
-    max_players: int = 20
-    player_names: List[str] = None
+    __slots__ = ('current_players', 'max_players', 'player_names')
+    
+    def __init__(self, current_players: int = 0, max_players: int = 20,
+                 player_names: Optional[List[str]] = None):
+        self.current_players = current_players
+        self.max_players = max_players
+        self.player_names = player_names if player_names is not None else []
     
-    def __init__(self):
-        self.player_names = []
+    def copy(self) -> 'PlayerListInfo':
+        """返回独立的副本(玩家名称列表也会复制)"""
+        return PlayerListInfo(self.current_players, self.max_players, list(self.player_names))
     
     def __str__(self):
         return f"PlayerListInfo{{current={self.current_players}, max={self.max_players}, players={', '.join(self.player_names)}}}"
+    
+    __repr__ = __str__
 
 
 class RCONClient:
@@ -28,7 +68,11 @@ class RCONClient:
     SERVERDATA_EXECCOMMAND = 2
     SERVERDATA_RESPONSE_VALUE = 0
     
-    def __init__(self, host: str, port: int, password: str, logger: logging.Logger, timeout: int = 10):
+    # 单条命令的超时时间(秒)，认证成功后设置到套接字上
+    COMMAND_TIMEOUT = 5.0
+    
+    def __init__(self, host: str, port: int, password: str, logger: logging.Logger, timeout: int = 10,
+                 list_cache_ttl: float = 5):
         self.host = host
         self.port = port
         self.password = password
@@ -37,6 +81,14 @@ class RCONClient:
         self.socket = None
         self.authenticated = False
         self.request_id = 0
+        # 复用的发送缓冲区，避免每个数据包都拼接新的 bytes
+        self._send_buf = bytearray(4096)
+        # 复用的长度前缀接收缓冲区
+        self._len_buf = bytearray(4)
+        # 玩家列表缓存，短时间内的重复查询直接返回上次结果
+        self.list_cache_ttl = list_cache_ttl
+        self._list_cache: Optional[PlayerListInfo] = None
+        self._list_cache_ts = 0.0
     
     def connect(self) -> bool:
         """连接到RCON服务器"""
@@ -44,10 +96,13 @@ class RCONClient:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.settimeout(self.timeout)
             self.socket.connect((self.host, self.port))
+            self._tune_socket()
             
             # 进行认证
             if self._authenticate():
                 self.authenticated = True
+                # 连接和认证使用 self.timeout，之后的命令统一使用较短的超时，无需每条命令切换
+                self.socket.settimeout(self.COMMAND_TIMEOUT)
                 self.logger.info(f"已连接到RCON服务器 {self.host}:{self.port}")
                 return True
             else:
@@ -65,6 +120,37 @@ class RCONClient:
             self.logger.error(f"连接RCON服务器失败: {e}")
             return False
     
+    def _tune_socket(self):
+        """关闭Nagle算法以降低小包往返延迟，并开启TCP保活以及时发现失效的长连接"""
+        try:
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        except OSError as e:
+            self.logger.debug(f"设置RCON套接字选项失败: {e}")
+            return
+        
+        # 保活参数并非所有平台都支持，逐项设置；macOS 上空闲时间选项名为 TCP_KEEPALIVE
+        idle_option = getattr(socket, 'TCP_KEEPIDLE', None) or getattr(socket, 'TCP_KEEPALIVE', None)
+        tuned = False
+        for option, value in ((idle_option, _KEEPALIVE_IDLE),
+                              (getattr(socket, 'TCP_KEEPINTVL', None), _KEEPALIVE_INTERVAL),
+                              (getattr(socket, 'TCP_KEEPCNT', None), _KEEPALIVE_COUNT)):
+            if option is None:
+                continue
+            try:
+                self.socket.setsockopt(socket.IPPROTO_TCP, option, value)
+                tuned = True
+            except OSError as e:
+                self.logger.debug(f"设置RCON保活参数失败: {e}")
+        
+        # 较旧的 Windows 不支持上述选项，改用 SIO_KEEPALIVE_VALS(单位毫秒)
+        if not tuned and hasattr(socket, 'SIO_KEEPALIVE_VALS'):
+            try:
+                self.socket.ioctl(socket.SIO_KEEPALIVE_VALS,
+                                  (1, _KEEPALIVE_IDLE * 1000, _KEEPALIVE_INTERVAL * 1000))
+            except OSError as e:
+                self.logger.debug(f"设置RCON保活参数失败: {e}")
+    
     def _authenticate(self) -> bool:
         """执行RCON认证"""
         try:
@@ -90,16 +176,21 @@ class RCONClient:
         request_id = self.request_id
         
         # 编码payload
-        payload_bytes = payload.encode('utf-8')
+        payload_bytes = _ENCODED_COMMANDS.get(payload) or payload.encode('utf-8')
+        payload_end = 12 + len(payload_bytes)
         
-        # 构建数据包: ID(4) + Type(4) + Payload + \x00\x00
-        packet = struct.pack('<ii', request_id, packet_type) + payload_bytes + b'\x00\x00'
+        # 数据包: Length(4) + ID(4) + Type(4) + Payload + \x00\x00
+        total_size = payload_end + 2
+        if total_size > len(self._send_buf):
+            self._send_buf = bytearray(max(total_size, len(self._send_buf) * 2))
         
-        # 添加长度前缀
-        packet_length = len(packet)
-        full_packet = struct.pack('<i', packet_length) + packet
+        buf = self._send_buf
+        _PACKET_HEADER.pack_into(buf, 0, total_size - 4, request_id, packet_type)
+        buf[12:payload_end] = payload_bytes
+        buf[payload_end:total_size] = b'\x00\x00'
         
-        self.socket.sendall(full_packet)
+        with memoryview(buf) as view:
+            self.socket.sendall(view[:total_size])
         return request_id
     
     def _receive_packet(self) -> tuple:
@@ -108,27 +199,33 @@ class RCONClient:
             raise Exception("RCON未连接")
         
         # 读取长度
-        length_data = self._recv_exact(4)
-        packet_length = struct.unpack('<i', length_data)[0]
+        self._recv_into(memoryview(self._len_buf))
+        packet_length = _PACKET_LENGTH.unpack_from(self._len_buf)[0]
         
         # 读取完整数据包
         packet_data = self._recv_exact(packet_length)
         
-        # 解析数据包
-        request_id, response_type = struct.unpack('<ii', packet_data[:8])
-        payload = packet_data[8:-2].decode('utf-8', errors='ignore')
+        # 解析数据包（直接在缓冲区上解析，不再切片复制）
+        request_id, response_type = _PACKET_ID_TYPE.unpack_from(packet_data)
+        payload = str(memoryview(packet_data)[8:-2], 'utf-8', 'ignore')
         
         return request_id, response_type, payload
     
-    def _recv_exact(self, size: int) -> bytes:
+    def _recv_exact(self, size: int) -> bytearray:
         """精确接收指定字节数"""
-        data = b''
-        while len(data) < size:
-            chunk = self.socket.recv(size - len(data))
-            if not chunk:
+        buf = bytearray(size)
+        self._recv_into(memoryview(buf))
+        return buf
+    
+    def _recv_into(self, view: memoryview):
+        """接收数据直到填满给定缓冲区"""
+        size = len(view)
+        received = 0
+        while received < size:
+            n = self.socket.recv_into(view[received:], size - received)
+            if not n:
                 raise Exception("连接已关闭")
-            data += chunk
-        return data
+            received += n
     
     def execute_command(self, command: str) -> Optional[str]:
         """执行RCON命令"""
@@ -140,19 +237,12 @@ class RCONClient:
             raise Exception("RCON连接已关闭")
         
         try:
-            # 设置较短的超时时间，避免长时间等待
-            original_timeout = self.socket.gettimeout()
-            self.socket.settimeout(5.0)  # 5秒超时
-            
             # 发送命令
             self._send_packet(self.SERVERDATA_EXECCOMMAND, command)
             
             # 接收响应
             _, _, response = self._receive_packet()
             
-            # 恢复原始超时设置
-            self.socket.settimeout(original_timeout)
-            
             return response
             
         except socket.timeout:
@@ -165,15 +255,27 @@ class RCONClient:
             self.close()
             return None
     
-    def get_player_list(self) -> PlayerListInfo:
-        """获取玩家列表"""
+    def get_player_list(self) -> Optional[PlayerListInfo]:
+        """获取玩家列表
+        
+        Returns:
+            玩家列表信息；命令执行失败(超时或连接断开)时返回 None，以便调用方区分"无人在线"和"查询失败"
+        """
+        now = time.monotonic()
+        # 缓存结果会返回给多个调用方，每次返回副本，调用方修改结果不会影响缓存
+        if self._list_cache is not None and now - self._list_cache_ts < self.list_cache_ttl:
+            return self._list_cache.copy()
+        
         info = PlayerListInfo()
         
         try:
             # 执行list命令
             response = self.execute_command("list")
             
-            if not response:
+            if response is None:
+                return None
+            
+            if not response.strip():
                 return info
             
             self.logger.debug(f"RCON list响应: {response}")
@@ -181,100 +283,72 @@ class RCONClient:
             # 改进的解析逻辑，支持多种语言格式
             info = self._parse_list_response(response)
             
-            return info
+            self._list_cache = info
+            self._list_cache_ts = now
+            return info.copy()
             
         except Exception as e:
             self.logger.error(f"获取RCON玩家列表失败: {e}", exc_info=True)
-            return info
+            return None
     
     def _parse_list_response(self, response: str) -> PlayerListInfo:
         """解析list命令响应，支持多种格式"""
         info = PlayerListInfo()
         
         # 移除颜色代码和多余空格
-        cleaned_response = re.sub(r'[Â§&][0-9a-fk-orA-FK-OR]', '', response).strip()
+        # 原版服务器通常不带颜色代码，先用字面量判断以跳过正则替换
+        if '§' in response or '&' in response or 'Â' in response:
+            cleaned_response = _COLOR_RE.sub('', response).strip()
+        else:
+            cleaned_response = response.strip()
         
         self.logger.debug(f"清理后的响应: {cleaned_response}")
         
         # ============ 第一步：解析在线人数和最大人数 ============
         
-        # 模式1: 英文标准格式 "There are X of a max of Y players online"
-        match = re.search(r'There are (\d+) of a max of (\d+) players online', cleaned_response, re.IGNORECASE)
+        for pattern_no, pattern in enumerate(_PAT_PLAYER_COUNTS, 1):
+            match = pattern.search(cleaned_response)
+            if match:
+                break
         if match:
             info.current_players = int(match.group(1))
             info.max_players = int(match.group(2))
-            self.logger.debug(f"匹配模式1: {info.current_players}/{info.max_players}")
-        
-        # 模式2: 英文变体格式 "There are X/Y players online"
-        if not match:
-            match = re.search(r'There are (\d+)/(\d+) players online', cleaned_response, re.IGNORECASE)
-            if match:
-                info.current_players = int(match.group(1))
-                info.max_players = int(match.group(2))
-                self.logger.debug(f"匹配模式2: {info.current_players}/{info.max_players}")
-        
-        # 模式3: 中文格式 "当前有 X 个玩家在线，最多 Y 人"
-        if not match:
-            match = re.search(r'当前有\s*(\d+)\s*个玩家在线.*?最多\s*(\d+)\s*人', cleaned_response)
-            if match:
-                info.current_players = int(match.group(1))
-                info.max_players = int(match.group(2))
-                self.logger.debug(f"匹配模式3: {info.current_players}/{info.max_players}")
-        
-        # 模式4: 中文简写格式 "玩家在线 X/Y"
-        if not match:
-            match = re.search(r'玩家在线\s*(\d+)/(\d+)', cleaned_response)
-            if match:
-                info.current_players = int(match.group(1))
-                info.max_players = int(match.group(2))
-                self.logger.debug(f"匹配模式4: {info.current_players}/{info.max_players}")
-        
-        # 模式5: 通用格式 "X of Y" 或 "X/Y"
-        if not match:
-            match = re.search(r'(\d+)\s*(?:of|/)\s*(\d+)', cleaned_response)
-            if match:
-                info.current_players = int(match.group(1))
-                info.max_players = int(match.group(2))
-                self.logger.debug(f"匹配模式5: {info.current_players}/{info.max_players}")
+            self.logger.debug(f"匹配模式{pattern_no}: {info.current_players}/{info.max_players}")
+            
+            # 明确无人在线时无需解析玩家名称
+            if info.current_players == 0:
+                self.logger.debug("无玩家在线，跳过玩家名称解析")
+                return info
         
         # ============ 第二步：解析玩家名称列表 ============
         
         player_names = []
+        seen = set()
         
         # 特殊处理：某些服务器会输出 "服主在线: xxx" 和 "default: yyy" 这样的分类格式
         # 我们需要合并所有玩家名称
         all_names_parts = []
         
+        # 以下所有提取方式都依赖冒号，没有冒号时无需再扫描
+        has_separator = ':' in cleaned_response or '：' in cleaned_response
+        
         # 模式：匹配 "服主在线: xxx" 或 "default: yyy" 等格式
-        category_matches = re.findall(r'(?:服主在线|default|在线玩家|players)[:：]\s*([^\n:：]+)', cleaned_response)
+        category_matches = _PAT_CATEGORY.findall(cleaned_response) if has_separator else []
         if category_matches:
             self.logger.debug(f"检测到分类格式，找到 {len(category_matches)} 个分类")
             all_names_parts.extend(category_matches)
         
         # 如果没有找到分类格式，尝试多个分隔符来定位玩家列表的起始位置
-        if not all_names_parts:
-            separators = [':', '：', 'online:', 'online：', '在线:']
-            player_part = ""
-            
-            for sep in separators:
-                if sep in cleaned_response:
-                    # 找到分隔符后面的内容
-                    parts = cleaned_response.split(sep, 1)
-                    if len(parts) > 1:
-                        player_part = parts[1].strip()
-                        if player_part:
-                            self.logger.debug(f"使用分隔符 '{sep}' 提取玩家列表: {player_part[:100]}")
-                            all_names_parts.append(player_part)
-                            break
-            
-            # 如果还没找到，尝试从最后一个数字后面提取
-            if not all_names_parts:
-                # 移除前面的数字和统计信息，保留玩家名称部分
-                match = re.search(r'[\d/]+\s+(?:players?|玩家|人).*?:\s*(.+)', cleaned_response, re.IGNORECASE)
-                if match:
-                    player_part = match.group(1).strip()
-                    self.logger.debug(f"从统计信息后提取玩家列表: {player_part[:100]}")
+        # 分隔符之后全是空白时，原先"从统计信息后提取"的兜底正则也只能匹配到空白，因此不再需要
+        if not all_names_parts and has_separator:
+            # 'online:'、'在线:' 等带前缀的分隔符都以 ':' 或 '：' 结尾，只需按这两个字符查找
+            for sep in (':', '：'):
+                _, found, player_part = cleaned_response.partition(sep)
+                player_part = player_part.strip()
+                if found and player_part:
+                    self.logger.debug(f"使用分隔符 '{sep}' 提取玩家列表: {player_part[:100]}")
                     all_names_parts.append(player_part)
+                    break
         
         # 处理玩家名称部分
         for player_part in all_names_parts:
@@ -289,7 +363,7 @@ class RCONClient:
             else:
                 # 如果没有逗号，尝试用多个空格或特殊字符分割
                 # 匹配连续的空格或其他分隔符
-                raw_names = re.split(r'\s{2,}|,|;|，|；|\n', player_part)
+                raw_names = _PAT_SPLIT.split(player_part)
                 raw_names = [name.strip() for name in raw_names if name.strip()]
                 self.logger.debug(f"使用正则分割，得到 {len(raw_names)} 个玩家")
             
@@ -297,10 +371,11 @@ class RCONClient:
             for name in raw_names:
                 # 移除特殊字符，保留字母、数字、下划线、中文、连字符
                 # 允许更多字符以支持各种命名规范
-                clean_name = re.sub(r'[\s\[\]\(\)\{\}<>\"\'`~!@#$%^&*|\\/?]+', '', name)
+                clean_name = name.translate(_NAME_DELETE_TABLE)
                 
                 # 过滤掉只包含特殊字符的项，以及已经添加过的重复项
-                if clean_name and clean_name not in [':', '：', 'online', '在线'] and clean_name not in player_names:
+                if clean_name and clean_name not in _REJECT_TOKENS and clean_name not in seen:
+                    seen.add(clean_name)
                     player_names.append(clean_name)
                     self.logger.debug(f"清理玩家名称: '{name}' -> '{clean_name}'")
         
@@ -332,8 +407,13 @@ class RCONClient:
         
         return info
     
+    def invalidate_list_cache(self):
+        """使玩家列表缓存失效(玩家进出、服务器停止后调用)"""
+        self._list_cache = None
+    
     def stop_server(self) -> bool:
         """停止服务器"""
+        self.invalidate_list_cache()
         try:
             response = self.execute_command("stop")
             return response is not None
@@ -344,6 +424,7 @@ class RCONClient:
     def close(self):
         """关闭连接"""
         self.authenticated = False
+        self.invalidate_list_cache()
         if self.socket:
             try:
                 self.socket.close()
@@ -352,17 +433,27 @@ class RCONClient:
             self.socket = None
     
     def is_connected(self) -> bool:
-        """检查是否已连接"""
+        """检查是否已连接(被动检查，不向服务器发送命令)"""
         if not self.socket or not self.authenticated:
             return False
         
         try:
-            # 尝试发送一个简单的命令来测试连接
-            self.socket.settimeout(1)
-            response = self.execute_command("list")
-            self.socket.settimeout(self.timeout)
-            return response is not None
-        except:
+            # 空闲连接上出现可读事件时，读到 EOF 说明对端已关闭
+            readable, _, _ = select.select([self.socket], [], [], 0)
+            if readable:
+                return bool(self.socket.recv(1, socket.MSG_PEEK))
+            return True
+        except (OSError, ValueError):
+            return False
+    
+    def ping(self) -> bool:
+        """通过执行 list 命令确认服务器仍在响应"""
+        if not self.is_connected():
+            return False
+        
+        try:
+            return self.execute_command("list") is not None
+        except Exception:
             return False
     
     def __enter__(self):
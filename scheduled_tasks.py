@@ -1,11 +1,30 @@
 import asyncio
+import heapq
+import itertools
 import logging
 import datetime
 import time
-from typing import Callable, List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any, Set
 from dataclasses import dataclass
 
 
+@dataclass
+class NotifyTemplate:
+    """通知消息模板，加载时判断一次是否包含 {countdown} 占位符"""
+    text: str
+    has_placeholder: bool = False
+    
+    @classmethod
+    def parse(cls, text: str) -> 'NotifyTemplate':
+        return cls(text, '{countdown}' in text)
+    
+    def render(self, countdown: int) -> str:
+        """生成通知消息"""
+        if not self.has_placeholder:
+            return self.text
+        return self.text.replace('{countdown}', str(countdown))
+
+
 @dataclass
 class ScheduledTask:
     """定时任务"""
@@ -13,17 +32,35 @@ class ScheduledTask:
     task_type: str  # 'start' 或 'stop' 或 'restart'
     scheduled_time: str  # HH:MM 格式
     weekdays: List[int]  # 执行的星期 [0=周一, 6=周日]
-    last_executed: Optional[float] = None
+    last_fired_key: int = -1  # 最近一次执行所在分钟的键(见 _minute_key)，同一分钟只执行一次
     enabled: bool = True
+    hour: int = 0  # 由 scheduled_time 解析，加载时计算一次
+    minute: int = 0
+    # 以下为加载时从对应配置段解析出的设置，不适用的为 None
+    pre_notify_seconds: Optional[int] = None
+    notify_message: Optional[NotifyTemplate] = None
+    warning_before_seconds: Optional[int] = None
+    first_warning: Optional[NotifyTemplate] = None
+    second_warning: Optional[NotifyTemplate] = None
+    wait_before_startup: Optional[int] = None
+    weekday_mask: int = 0  # 由 weekdays 计算，第 i 位表示星期 i 执行
+    weekday_names_str: str = ""  # 加载时生成的星期名称列表，用于日志与任务列表
+    
+    def __post_init__(self):
+        self.weekday_mask = 0
+        for day in self.weekdays:
+            self.weekday_mask |= 1 << day
 
 
 class ScheduledTaskManager:
     """定时任务管理器 - 支持星期配置"""
     
-    WEEKDAY_NAMES = {
-        0: '周一', 1: '周二', 2: '周三', 3: '周四',
-        4: '周五', 5: '周六', 6: '周日'
-    }
+    WEEKDAY_NAMES = ('周一', '周二', '周三', '周四', '周五', '周六', '周日')
+    
+    # 调度循环无事件时的最长休眠时间(秒)，用于兜底系统时间调整
+    MAX_SLEEP_SECONDS = 300
+    # 任务执行时间已过超过该秒数时跳过本次执行(如系统休眠唤醒后)
+    MAX_LATE_SECONDS = 60
     
     def __init__(self, config_manager, qq_server, logger: logging.Logger):
         self.config_manager = config_manager
@@ -31,9 +68,22 @@ class ScheduledTaskManager:
         self.logger = logger
         
         self.tasks: List[ScheduledTask] = []
+        # 按执行时间 (时, 分) 分组的任务索引，加载配置时构建
+        self._tasks_by_time: Dict[tuple, List[ScheduledTask]] = {}
+        # 按任务ID的索引，用于启用/禁用任务
+        self._by_id: Dict[str, ScheduledTask] = {}
         self.running = False
         self.scheduler_task = None
         
+        # 待触发事件的最小堆: (时间戳, 序号, 事件类型, 任务, 任务执行时间戳)
+        # 事件类型: 'fire' 执行任务, 'pre_notify'/'first_warning'/'second_warning' 提前通知
+        self._deadlines_heap: List[tuple] = []
+        self._heap_seq = itertools.count()
+        self._wake_event = asyncio.Event()
+        self._stop_event = asyncio.Event()
+        # 后台运行中的重启流程，持有引用防止被回收
+        self._pending: Set[asyncio.Task] = set()
+        
         # 回调函数
         self.on_start_callback: Optional[Callable] = None
         self.on_stop_callback: Optional[Callable] = None
@@ -41,6 +91,15 @@ class ScheduledTaskManager:
         self.on_notify_callback: Optional[Callable] = None
         
         self._load_tasks_from_config()
+        self._index_tasks()
+    
+    def _index_tasks(self):
+        """按执行时间和任务ID重建任务索引"""
+        self._tasks_by_time = {}
+        self._by_id = {}
+        for task in self.tasks:
+            self._tasks_by_time.setdefault((task.hour, task.minute), []).append(task)
+            self._by_id[task.task_id] = task
     
     def _load_tasks_from_config(self):
         """从配置文件加载定时任务"""
@@ -51,65 +110,75 @@ class ScheduledTaskManager:
                 self.logger.info("定时任务已禁用")
                 return
             
-            # 加载自动启动任务
-            auto_start_config = scheduled_config.get('auto_start', {})
-            if auto_start_config.get('enabled', False):
-                start_times = auto_start_config.get('times', [])
-                start_weekdays = auto_start_config.get('weekdays', [0, 1, 2, 3, 4, 5, 6])
-                
-                for i, time_str in enumerate(start_times):
-                    task = ScheduledTask(
-                        task_id=f"auto_start_{i}",
-                        task_type='start',
-                        scheduled_time=time_str,
-                        weekdays=start_weekdays,
-                        enabled=True
-                    )
-                    self.tasks.append(task)
-                    weekday_names = [self.WEEKDAY_NAMES[d] for d in start_weekdays]
-                    self.logger.info(f"已加载自动启动任务: {time_str} ({','.join(weekday_names)})")
-            
-            # 加载自动停止任务
-            auto_stop_config = scheduled_config.get('auto_stop', {})
-            if auto_stop_config.get('enabled', False):
-                stop_times = auto_stop_config.get('times', [])
-                stop_weekdays = auto_stop_config.get('weekdays', [0, 1, 2, 3, 4, 5, 6])
+            # 依次加载自动启动/停止/重启任务
+            for task_type, kind in (('start', '启动'), ('stop', '停止'), ('restart', '重启')):
+                cfg_key = f"auto_{task_type}"
+                task_config = scheduled_config.get(cfg_key, {})
+                if not task_config.get('enabled', False):
+                    continue
                 
-                for i, time_str in enumerate(stop_times):
-                    task = ScheduledTask(
-                        task_id=f"auto_stop_{i}",
-                        task_type='stop',
-                        scheduled_time=time_str,
-                        weekdays=stop_weekdays,
-                        enabled=True
-                    )
-                    self.tasks.append(task)
-                    weekday_names = [self.WEEKDAY_NAMES[d] for d in stop_weekdays]
-                    self.logger.info(f"已加载自动停止任务: {time_str} ({','.join(weekday_names)})")
-            
-            # 加载自动重启任务
-            auto_restart_config = scheduled_config.get('auto_restart', {})
-            if auto_restart_config.get('enabled', False):
-                restart_times = auto_restart_config.get('times', [])
-                restart_weekdays = auto_restart_config.get('weekdays', [0, 1, 2, 3, 4, 5, 6])
+                weekdays = task_config.get('weekdays', [0, 1, 2, 3, 4, 5, 6])
+                weekday_names = ','.join(self.WEEKDAY_NAMES[d] for d in weekdays)
+                settings = self._task_settings(task_type, task_config)
                 
-                for i, time_str in enumerate(restart_times):
+                for i, time_str in enumerate(task_config.get('times', [])):
+                    parsed = self._parse_time(time_str)
+                    if parsed is None:
+                        self.logger.error(f"定时任务时间格式无效(应为 HH:MM): {time_str}")
+                        continue
                     task = ScheduledTask(
-                        task_id=f"auto_restart_{i}",
-                        task_type='restart',
+                        task_id=f"{cfg_key}_{i}",
+                        task_type=task_type,
                         scheduled_time=time_str,
-                        weekdays=restart_weekdays,
-                        enabled=True
+                        weekdays=weekdays,
+                        enabled=True,
+                        hour=parsed[0],
+                        minute=parsed[1],
+                        weekday_names_str=weekday_names,
+                        **settings
                     )
                     self.tasks.append(task)
-                    weekday_names = [self.WEEKDAY_NAMES[d] for d in restart_weekdays]
-                    self.logger.info(f"已加载自动重启任务: {time_str} ({','.join(weekday_names)})")
+                    if self.logger.isEnabledFor(logging.INFO):
+                        self.logger.info(f"已加载自动{kind}任务: {time_str} ({weekday_names})")
             
             self.logger.info(f"共加载 {len(self.tasks)} 个定时任务")
             
         except Exception as e:
             self.logger.error(f"加载定时任务配置失败: {e}", exc_info=True)
     
+    @staticmethod
+    def _task_settings(task_type: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """解析任务类型对应配置段中的通知与等待设置"""
+        if task_type == 'start':
+            return {
+                'pre_notify_seconds': config.get('pre_notify_seconds', 300),
+                'notify_message': NotifyTemplate.parse(
+                    config.get('notify_message', '服务器将在 {countdown} 秒后启动')),
+            }
+        
+        action = '关闭' if task_type == 'stop' else '重启'
+        settings = {
+            'warning_before_seconds': config.get('warning_before_seconds', 600),
+            'first_warning': NotifyTemplate.parse(
+                config.get('first_warning', f'服务器将在 {{countdown}} 秒后{action}')),
+            'second_warning': NotifyTemplate.parse(
+                config.get('second_warning', f'服务器即将在 1 分钟后{action}')),
+        }
+        if task_type == 'restart':
+            settings['wait_before_startup'] = config.get('wait_before_startup', 10)
+        return settings
+    
+    @staticmethod
+    def _parse_time(time_str: str) -> Optional[tuple]:
+        """解析 HH:MM 格式的时间，无效时返回None"""
+        try:
+            hour, minute = map(int, str(time_str).split(':'))
+        except ValueError:
+            return None
+        if not (0 <= hour < 24 and 0 <= minute < 60):
+            return None
+        return hour, minute
+    
     def set_start_callback(self, callback: Callable):
         """设置启动回调函数"""
         self.on_start_callback = callback
@@ -125,6 +194,9 @@ class ScheduledTaskManager:
     def set_notify_callback(self, callback: Callable):
         """设置通知回调函数"""
         self.on_notify_callback = callback
+        # 提前通知是否入堆取决于回调是否存在，运行中变更时需重建事件堆
+        if self.running:
+            self._rebuild_schedule()
     
     def start(self):
         """启动定时任务管理器"""
@@ -133,155 +205,219 @@ class ScheduledTaskManager:
             return
         
         self.running = True
+        self._stop_event.clear()
         self.logger.info("定时任务管理器已启动")
         
+        self._rebuild_schedule()
+        # stop() 后立即重新启动时旧的调度循环可能还在等待中，
+        # 它发现自己不再是 scheduler_task 后自行退出，不会与新循环同时运行
         self.scheduler_task = asyncio.create_task(self._scheduler_loop())
     
     def stop(self):
-        """停止定时任务管理器"""
+        """停止定时任务管理器 - 通过事件通知调度循环退出，而不是取消任务"""
         self.running = False
-        
-        if self.scheduler_task and not self.scheduler_task.done():
-            self.scheduler_task.cancel()
+        self._stop_event.set()
+        self._wake_event.set()
         
         self.logger.info("定时任务管理器已停止")
     
     async def _scheduler_loop(self):
-        """定时任务调度循环"""
+        """定时任务调度循环 - 休眠到最近的事件时间点，重载或启停任务时被唤醒"""
         try:
             self.logger.info("定时任务调度循环已启动")
+            # 连续出现相同错误时只在首次输出堆栈
+            last_error = None
+            error_repeat = 0
+            current = asyncio.current_task()
             
-            while self.running:
+            while self.running and self.scheduler_task is current:
                 try:
-                    current_time = datetime.datetime.now()
-                    current_weekday = current_time.weekday()  # 0=周一, 6=周日
-                    current_hour_minute = current_time.strftime("%H:%M")
-                    current_timestamp = time.time()
+                    heap = self._deadlines_heap
                     
-                    for task in self.tasks:
+                    if heap and heap[0][0] <= time.time():
+                        _, _, kind, task, fire_ts = heapq.heappop(heap)
                         if not task.enabled:
                             continue
                         
-                        # 检查星期是否匹配
-                        if current_weekday not in task.weekdays:
-                            continue
-                        
-                        # 检查是否到达定时时间
-                        if task.scheduled_time == current_hour_minute:
-                            # 防止重复执行 (同一分钟内只执行一次)
-                            if task.last_executed is not None:
-                                time_since_last = current_timestamp - task.last_executed
-                                if time_since_last < 60:
-                                    continue
-                            
-                            # 执行任务
-                            await self._execute_task(task, current_time)
-                            task.last_executed = current_timestamp
+                        if kind == 'fire':
+                            fire_time = datetime.datetime.fromtimestamp(fire_ts)
+                            minute_key = self._minute_key(fire_time)
+                            if minute_key == task.last_fired_key:
+                                continue
+                            # 执行前记录，执行期间重建事件堆也不会重复触发本分钟
+                            task.last_fired_key = minute_key
+                            late = time.time() - fire_ts
+                            if late > self.MAX_LATE_SECONDS:
+                                # 系统休眠或时间被调整后不再补执行已错过的任务
+                                self.logger.warning(
+                                    f"定时任务 '{task.task_id}' 已错过执行时间 "
+                                    f"{fire_time.strftime('%Y-%m-%d %H:%M')} ({late:.0f} 秒)，跳过本次执行"
+                                )
+                                self._schedule_task(task, time.time())
+                                continue
+                            await self._execute_task(task, fire_time)
+                            # 安排下一次执行(跳过本分钟)；执行期间事件堆已重建时新堆中已包含该任务
+                            if heap is self._deadlines_heap:
+                                self._schedule_task(task, fire_ts + 60)
+                        elif fire_ts <= time.time():
+                            # 任务执行时间已过，提前通知已无意义；下一次执行由对应的 fire 事件安排
+                            self.logger.info(f"定时任务 '{task.task_id}' 的提前通知已过期，跳过")
+                        else:
+                            await self._send_task_warning(task, kind, fire_ts)
+                        continue
                     
-                    # 检查即将到达的任务，发送提前通知
-                    await self._check_upcoming_tasks(current_time, current_weekday)
+                    timeout = self.MAX_SLEEP_SECONDS
+                    if heap:
+                        timeout = min(timeout, max(0.0, heap[0][0] - time.time()))
                     
-                    # 每10秒检查一次
-                    await asyncio.sleep(10)
+                    last_error = None
+                    self._wake_event.clear()
+                    try:
+                        await asyncio.wait_for(self._wake_event.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
                     
                 except asyncio.CancelledError:
                     raise
                 except Exception as e:
-                    self.logger.error(f"定时任务调度出错: {e}", exc_info=True)
-                    await asyncio.sleep(10)
+                    error_sig = repr(e)
+                    if error_sig == last_error:
+                        error_repeat += 1
+                        self.logger.warning(f"定时任务调度出错 (重复 {error_repeat} 次): {e}")
+                    else:
+                        last_error = error_sig
+                        error_repeat = 0
+                        self.logger.error(f"定时任务调度出错: {e}", exc_info=True)
+                    await self._wait_for_stop(10)
         
         except asyncio.CancelledError:
             self.logger.info("定时任务调度循环已取消")
         except Exception as e:
             self.logger.error(f"定时任务调度循环异常: {e}", exc_info=True)
     
-    async def _check_upcoming_tasks(self, current_time: datetime.datetime, current_weekday: int):
-        """检查即将到达的任务并发送提前通知"""
+    async def _wait_for_stop(self, timeout: float) -> bool:
+        """等待至多 timeout 秒，期间管理器被停止时立即返回True"""
         try:
-            scheduled_config = self.config_manager.config.get('scheduled_tasks', {})
+            await asyncio.wait_for(self._stop_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    def _rebuild_schedule(self):
+        """根据当前任务列表重建事件堆，并唤醒调度循环"""
+        self._deadlines_heap = []
+        now = time.time()
+        # 同一时间点的任务共用同一个当天执行时间
+        for tasks in self._tasks_by_time.values():
+            base = self._time_today(tasks[0], now)
+            for task in tasks:
+                if task.enabled:
+                    self._schedule_task(task, now, base)
+        self._wake_event.set()
+    
+    @staticmethod
+    def _time_today(task: ScheduledTask, ts: float) -> datetime.datetime:
+        """返回 ts 当天任务计划执行的时间"""
+        return datetime.datetime.fromtimestamp(ts).replace(
+            hour=task.hour, minute=task.minute, second=0, microsecond=0
+        )
+    
+    @staticmethod
+    def _minute_key(dt: datetime.datetime) -> int:
+        """把本地时间换算为按分钟计的整数键"""
+        return dt.toordinal() * 1440 + dt.hour * 60 + dt.minute
+    
+    def _next_fire_time(self, task: ScheduledTask, after: float,
+                        base: Optional[datetime.datetime] = None) -> Optional[float]:
+        """计算任务在 after 之后(含 after 所在分钟)的下一次执行时间戳
+        
+        Args:
+            base: after 当天的计划执行时间，已解析过时可直接传入
+        """
+        if base is None:
+            base = self._time_today(task, after)
+        
+        for offset in range(8):
+            candidate = base + datetime.timedelta(days=offset)
+            if not (task.weekday_mask >> candidate.weekday()) & 1:
+                continue
             
-            for task in self.tasks:
-                if not task.enabled:
-                    continue
-                
-                # 检查星期是否匹配
-                if current_weekday not in task.weekdays:
-                    continue
-                
-                # 解析计划时间
-                try:
-                    task_hour, task_minute = map(int, task.scheduled_time.split(':'))
-                    task_datetime = current_time.replace(hour=task_hour, minute=task_minute, second=0, microsecond=0)
-                except ValueError:
-                    continue
-                
-                # 计算距离任务执行的时间
-                time_until_task = (task_datetime - current_time).total_seconds()
-                
-                if task.task_type == 'start':
-                    config = scheduled_config.get('auto_start', {})
-                    pre_notify = config.get('pre_notify_seconds', 300)
-                    
-                    if 0 <= time_until_task < pre_notify and time_until_task > pre_notify - 10:
-                        await self._send_notify(
-                            task,
-                            config.get('notify_message', '服务器将在 {countdown} 秒后启动'),
-                            int(time_until_task)
-                        )
-                
-                elif task.task_type == 'stop':
-                    config = scheduled_config.get('auto_stop', {})
-                    warning_before = config.get('warning_before_seconds', 600)
-                    
-                    if 0 <= time_until_task < warning_before and time_until_task > warning_before - 10:
-                        await self._send_notify(
-                            task,
-                            config.get('first_warning', '服务器将在 {countdown} 秒后关闭'),
-                            int(time_until_task)
-                        )
-                    
-                    elif 50 <= time_until_task < 70:
-                        await self._send_notify(
-                            task,
-                            config.get('second_warning', '服务器即将在 1 分钟后关闭'),
-                            60
-                        )
-                
-                elif task.task_type == 'restart':
-                    config = scheduled_config.get('auto_restart', {})
-                    warning_before = config.get('warning_before_seconds', 600)
-                    
-                    if 0 <= time_until_task < warning_before and time_until_task > warning_before - 10:
-                        await self._send_notify(
-                            task,
-                            config.get('first_warning', '服务器将在 {countdown} 秒后重启'),
-                            int(time_until_task)
-                        )
-                    
-                    elif 50 <= time_until_task < 70:
-                        await self._send_notify(
-                            task,
-                            config.get('second_warning', '服务器即将在 1 分钟后重启'),
-                            60
-                        )
+            fire_ts = candidate.timestamp()
+            # 该分钟已经过去
+            if fire_ts + 60 <= after:
+                continue
+            # 防止重复执行 (同一分钟内只执行一次)
+            if self._minute_key(candidate) == task.last_fired_key:
+                continue
+            return fire_ts
+        
+        return None
+    
+    def _schedule_task(self, task: ScheduledTask, after: float,
+                       base: Optional[datetime.datetime] = None):
+        """将任务的下一次执行及其提前通知加入事件堆"""
+        fire_ts = self._next_fire_time(task, after, base)
+        if fire_ts is None:
+            return
+        
+        heap = self._deadlines_heap
+        heapq.heappush(heap, (fire_ts, next(self._heap_seq), 'fire', task, fire_ts))
+        
+        # 未设置通知回调时提前通知只会输出日志，不安排
+        if self.on_notify_callback is None:
+            return
+        
+        now = time.time()
+        for kind, lead in self._warning_leads(task):
+            notify_ts = fire_ts - lead
+            if notify_ts >= now:
+                heapq.heappush(heap, (notify_ts, next(self._heap_seq), kind, task, fire_ts))
+    
+    def _warning_leads(self, task: ScheduledTask) -> List[tuple]:
+        """返回任务的提前通知类型及提前秒数"""
+        if task.pre_notify_seconds is not None:
+            return [('pre_notify', task.pre_notify_seconds)]
+        if task.warning_before_seconds is not None:
+            return [('first_warning', task.warning_before_seconds), ('second_warning', 60)]
+        return []
+    
+    async def _send_task_warning(self, task: ScheduledTask, kind: str, fire_ts: float):
+        """发送任务的提前通知"""
+        try:
+            countdown = max(0, round(fire_ts - time.time()))
+            
+            if kind == 'pre_notify':
+                await self._send_notify(task, task.notify_message, countdown)
+            elif kind == 'first_warning':
+                await self._send_notify(task, task.first_warning, countdown)
+            else:
+                await self._send_notify(task, task.second_warning, 60)
         
         except Exception as e:
-            self.logger.error(f"检查即将到达的任务出错: {e}", exc_info=True)
+            self.logger.error(f"发送定时任务提前通知出错: {e}", exc_info=True)
+    
+    def _is_server_running(self) -> bool:
+        """服务器进程是否在运行"""
+        process = self.qq_server.server_process
+        return bool(process and process.poll() is None)
     
     async def _execute_task(self, task: ScheduledTask, current_time: datetime.datetime):
         """执行定时任务"""
         try:
-            weekday_name = self.WEEKDAY_NAMES[current_time.weekday()]
-            self.logger.info(f"执行定时任务: {task.task_id} ({task.task_type}) - {task.scheduled_time} ({weekday_name})")
+            # 只判断一次日志级别，关闭 INFO 时跳过消息格式化
+            info = self.logger.isEnabledFor(logging.INFO)
+            if info:
+                weekday_name = self.WEEKDAY_NAMES[current_time.weekday()]
+                self.logger.info(f"执行定时任务: {task.task_id} ({task.task_type}) - {task.scheduled_time} ({weekday_name})")
             
             if task.task_type == 'start':
-                if (self.qq_server.server_process and 
-                    self.qq_server.server_process.poll() is None):
-                    self.logger.warning(f"服务器已在运行,跳过启动任务")
-                    await self._send_notify(task, "服务器已在运行,无需启动", 0)
+                if self._is_server_running():
+                    self.logger.warning("服务器已在运行,跳过启动任务")
+                    await self._send_notify(task, NotifyTemplate("服务器已在运行,无需启动"), 0)
                     return
                 
-                self.logger.info(f"执行启动任务: {task.scheduled_time}")
+                if info:
+                    self.logger.info(f"执行启动任务: {task.scheduled_time}")
                 
                 if self.on_start_callback:
                     await self.on_start_callback(task)
@@ -289,13 +425,13 @@ class ScheduledTaskManager:
                     self.logger.warning("启动回调函数未设置")
             
             elif task.task_type == 'stop':
-                if not (self.qq_server.server_process and 
-                        self.qq_server.server_process.poll() is None):
-                    self.logger.warning(f"服务器未运行,跳过停止任务")
-                    await self._send_notify(task, "服务器未运行,无需停止", 0)
+                if not self._is_server_running():
+                    self.logger.warning("服务器未运行,跳过停止任务")
+                    await self._send_notify(task, NotifyTemplate("服务器未运行,无需停止"), 0)
                     return
                 
-                self.logger.info(f"执行停止任务: {task.scheduled_time}")
+                if info:
+                    self.logger.info(f"执行停止任务: {task.scheduled_time}")
                 
                 if self.on_stop_callback:
                     await self.on_stop_callback(task)
@@ -303,36 +439,46 @@ class ScheduledTaskManager:
                     self.logger.warning("停止回调函数未设置")
             
             elif task.task_type == 'restart':
-                if not (self.qq_server.server_process and 
-                        self.qq_server.server_process.poll() is None):
-                    self.logger.warning(f"服务器未运行,跳过重启任务")
-                    await self._send_notify(task, "服务器未运行,无需重启", 0)
+                if not self._is_server_running():
+                    self.logger.warning("服务器未运行,跳过重启任务")
+                    await self._send_notify(task, NotifyTemplate("服务器未运行,无需重启"), 0)
                     return
                 
-                self.logger.info(f"执行重启任务: {task.scheduled_time}")
+                if info:
+                    self.logger.info(f"执行重启任务: {task.scheduled_time}")
                 
-                if self.on_stop_callback:
-                    await self.on_stop_callback(task)
-                
-                scheduled_config = self.config_manager.config.get('scheduled_tasks', {})
-                restart_config = scheduled_config.get('auto_restart', {})
-                
-                wait_time = restart_config.get('wait_before_startup', 10)
-                self.logger.info(f"等待 {wait_time} 秒后重启服务器...")
-                await asyncio.sleep(wait_time)
-                
-                if self.on_restart_callback:
-                    await self.on_restart_callback(task)
-                else:
-                    self.logger.warning("重启回调函数未设置")
+                # 重启流程在后台运行，等待期间不阻塞其他任务的调度
+                restart_task = asyncio.create_task(self._run_restart(task))
+                self._pending.add(restart_task)
+                restart_task.add_done_callback(self._pending.discard)
         
         except Exception as e:
             self.logger.error(f"执行定时任务失败: {e}", exc_info=True)
     
-    async def _send_notify(self, task: ScheduledTask, message_template: str, countdown: int):
+    async def _run_restart(self, task: ScheduledTask):
+        """重启流程: 停止服务器 -> 等待 -> 启动服务器"""
+        try:
+            if self.on_stop_callback:
+                await self.on_stop_callback(task)
+            
+            wait_time = task.wait_before_startup
+            self.logger.info(f"等待 {wait_time} 秒后重启服务器...")
+            if await self._wait_for_stop(wait_time):
+                self.logger.info("定时任务管理器已停止，取消重启")
+                return
+            
+            if self.on_restart_callback:
+                await self.on_restart_callback(task)
+            else:
+                self.logger.warning("重启回调函数未设置")
+        
+        except Exception as e:
+            self.logger.error(f"执行重启任务失败: {e}", exc_info=True)
+    
+    async def _send_notify(self, task: ScheduledTask, template: NotifyTemplate, countdown: int):
         """发送通知"""
         try:
-            message = message_template.replace('{countdown}', str(countdown))
+            message = template.render(countdown)
             
             if self.on_notify_callback:
                 await self.on_notify_callback(task, message)
@@ -346,6 +492,9 @@ class ScheduledTaskManager:
         """重新加载配置中的定时任务"""
         self.tasks.clear()
         self._load_tasks_from_config()
+        self._index_tasks()
+        if self.running:
+            self._rebuild_schedule()
         self.logger.info("定时任务已重新加载")
     
     def list_tasks(self) -> str:
@@ -353,50 +502,41 @@ class ScheduledTaskManager:
         if not self.tasks:
             return "未配置任何定时任务"
         
-        message = "定时任务列表\n" + "=" * 50 + "\n"
-        
-        start_tasks = [t for t in self.tasks if t.task_type == 'start']
-        stop_tasks = [t for t in self.tasks if t.task_type == 'stop']
-        restart_tasks = [t for t in self.tasks if t.task_type == 'restart']
-        
-        if start_tasks:
-            message += "启动任务:\n"
-            for task in start_tasks:
-                status = "启用" if task.enabled else "禁用"
-                weekday_names = [self.WEEKDAY_NAMES[d] for d in task.weekdays]
-                message += f"  • {task.scheduled_time} [{status}] ({','.join(weekday_names)})\n"
-        
-        if stop_tasks:
-            message += "\n停止任务:\n"
-            for task in stop_tasks:
-                status = "启用" if task.enabled else "禁用"
-                weekday_names = [self.WEEKDAY_NAMES[d] for d in task.weekdays]
-                message += f"  • {task.scheduled_time} [{status}] ({','.join(weekday_names)})\n"
+        buckets: Dict[str, List[ScheduledTask]] = {'start': [], 'stop': [], 'restart': []}
+        for task in self.tasks:
+            buckets[task.task_type].append(task)
         
-        if restart_tasks:
-            message += "\n重启任务:\n"
-            for task in restart_tasks:
+        parts = ["定时任务列表\n", "=" * 50, "\n"]
+        for task_type, header in (('start', "启动任务:\n"),
+                                  ('stop', "\n停止任务:\n"),
+                                  ('restart', "\n重启任务:\n")):
+            tasks = buckets[task_type]
+            if not tasks:
+                continue
+            parts.append(header)
+            for task in tasks:
                 status = "启用" if task.enabled else "禁用"
-                weekday_names = [self.WEEKDAY_NAMES[d] for d in task.weekdays]
-                message += f"  • {task.scheduled_time} [{status}] ({','.join(weekday_names)})\n"
+                parts.append(f"  • {task.scheduled_time} [{status}] ({task.weekday_names_str})\n")
         
-        message += "=" * 50
-        return message
+        parts.append("=" * 50)
+        return ''.join(parts)
     
     def disable_task(self, task_id: str) -> bool:
         """禁用指定任务"""
-        for task in self.tasks:
-            if task.task_id == task_id:
-                task.enabled = False
-                self.logger.info(f"已禁用任务: {task_id}")
-                return True
-        return False
+        task = self._by_id.get(task_id)
+        if task is None:
+            return False
+        task.enabled = False
+        self._rebuild_schedule()
+        self.logger.info(f"已禁用任务: {task_id}")
+        return True
     
     def enable_task(self, task_id: str) -> bool:
         """启用指定任务"""
-        for task in self.tasks:
-            if task.task_id == task_id:
-                task.enabled = True
-                self.logger.info(f"已启用任务: {task_id}")
-                return True
-        return False
\ No newline at end of file
+        task = self._by_id.get(task_id)
+        if task is None:
+            return False
+        task.enabled = True
+        self._rebuild_schedule()
+        self.logger.info(f"已启用任务: {task_id}")
+        return True
\ No newline at end of file
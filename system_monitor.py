@@ -1,14 +1,62 @@
 import psutil
 import logging
+import os
 import platform
+import threading
 import time
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from typing import Callable, Dict, Any, NamedTuple, Optional
 from datetime import datetime, date
 
-@dataclass
-class SystemStats:
-    """系统统计数据"""
+
+# format_bytes 使用的单位，第 i 个单位对应 1024**i 字节
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# 磁盘使用率进度条，第 i 项为已用 i 格
+_DISK_BAR_LENGTH = 20
+_DISK_BARS = tuple("█" * i + "░" * (_DISK_BAR_LENGTH - i) for i in range(_DISK_BAR_LENGTH + 1))
+
+
+def _format_bytes(bytes_value) -> str:
+    """格式化字节数为可读格式，单位由整数位数直接算出"""
+    if bytes_value < 1024:
+        return f"{bytes_value:.2f} B"
+    exp = min((int(bytes_value).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{bytes_value / (1 << (10 * exp)):.2f} {_BYTE_UNITS[exp]}"
+
+
+def _format_speed(speed_mbps: float) -> str:
+    """格式化网络速度为可读格式"""
+    if speed_mbps < 0.01:
+        speed_kbps = speed_mbps * 1024
+        return f"{speed_kbps:.2f} KB/s"
+    elif speed_mbps < 1000:
+        return f"{speed_mbps:.2f} MB/s"
+    else:
+        speed_gbps = speed_mbps / 1024
+        return f"{speed_gbps:.2f} GB/s"
+
+
+def _disk_usage(path: str) -> tuple:
+    """返回磁盘的 (总量, 已用, 可用, 使用率)，计算方式与 psutil.disk_usage 一致
+    
+    支持 statvfs 的平台直接读取，省去 psutil 的中间对象；其余平台使用 psutil。
+    """
+    if not hasattr(os, 'statvfs'):
+        disk = psutil.disk_usage(path)
+        return (disk.total, disk.used, disk.free, disk.percent)
+    
+    st = os.statvfs(path)
+    total = st.f_blocks * st.f_frsize
+    free = st.f_bavail * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    # 使用率按普通用户可用的空间计算(不含保留块)
+    total_user = used + free
+    percent = round(used / total_user * 100, 1) if total_user else 0.0
+    return (total, used, free, percent)
+
+
+class SystemStats(NamedTuple):
+    """系统统计数据，采样后不再修改，可在线程间共享"""
     cpu_percent: float
     cpu_count: int
     cpu_freq: float
@@ -25,55 +73,260 @@ class SystemStats:
     net_recv_speed: float
     boot_time: float
     timestamp: float
+    daily_sent: int = 0  # 当天的网络使用量
+    daily_recv: int = 0
 
 
 class SystemMonitor:
     """系统监控工具"""
     
-    def __init__(self, logger: logging.Logger):
+    # 两次 CPU 使用率采样的最短间隔(秒)，间隔过短时结果没有意义
+    MIN_CPU_SAMPLE_INTERVAL = 0.2
+    # 两次实际读取 psutil 的最短间隔(秒)，间隔内的重复查询直接返回上次结果
+    MIN_SAMPLE_INTERVAL = 0.5
+    # 磁盘用量缓存时间(秒)
+    DISK_CACHE_TTL = 2
+    # 网卡状态缓存时间(秒)，网卡上下线远没有流量变化频繁
+    IF_STATS_CACHE_TTL = 30
+    
+    # 系统信息消息模板
+    SYSTEM_INFO_TEMPLATE = (
+        "系统监控信息\n"
+        "━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+        "系统: {platform}\n"
+        "运行时间: {uptime}\n"
+        "更新时间: {update_time}\n\n"
+        
+        "CPU信息:\n"
+        "  核心数: {cpu_count}\n"
+        "{cpu_freq_info}"
+        "{core_freqs}"
+        "  使用率: {cpu_status} {cpu_percent:.1f}%\n\n"
+        
+        "内存信息:\n"
+        "  已用: {memory_used}\n"
+        "  总量: {memory_total}\n"
+        "  使用率: {mem_status} {memory_percent:.1f}%\n\n"
+        
+        "硬盘信息 (/):\n"
+        "  已用: {disk_used}\n"
+        "  可用: {disk_free}\n"
+        "  总量: {disk_total}\n"
+        "  使用率: {disk_status} {disk_percent:.1f}%\n\n"
+        
+        "网络流量 (今日 {today}):\n"
+        "  上传: {daily_sent}\n"
+        "  下载: {daily_recv}\n\n"
+        
+        "网络流量 (系统启动后):\n"
+        "  上传: {net_sent}\n"
+        "  下载: {net_recv}\n\n"
+        
+        "实时带宽:\n"
+        "  上传速度: {net_sent_speed}\n"
+        "  下载速度: {net_recv_speed}\n"
+        "━━━━━━━━━━━━━━━━━━━━━━━━━━"
+    )
+    
+    def __init__(self, logger: logging.Logger, sample_period: float = 2):
+        """
+        Args:
+            sample_period: 后台采样线程的采样间隔（秒），默认2秒
+        """
         self.logger = logger
-        self.previous_net_stats = None
-        self.previous_timestamp = None
+        
+        # 预先采样一次 CPU 使用率，之后以非阻塞方式读取与上次采样之间的使用率
+        psutil.cpu_percent(interval=None)
+        self._last_cpu_sample_t = time.monotonic()
+        
+        # 查询结果缓存及其采样时间 (time.monotonic)
+        self._stats_cache: Optional[SystemStats] = None
+        self._stats_cache_ts = 0.0
+        # 最近一次采样读取的每核心频率信息，不支持频率读取时为 None
+        self._cpu_info: Optional[Dict[str, Any]] = None
+        # 部分平台(如 WSL、容器)无法读取CPU频率，启动时检测一次，不支持时不再尝试
+        self._cpu_freq_fn: Optional[Callable] = self._detect_cpu_freq()
+        # 运行时间字符串缓存: (运行秒数, 字符串)
+        self._uptime_cache: Optional[tuple] = None
+        
+        # 查询可能在多个线程中并发执行，串行化对共享 Process 对象的 cpu_percent 读取
+        self._proc_lock = threading.Lock()
+        self._memory_total: Optional[int] = None  # 物理内存总量不会变化，首次使用时读取
+        # 按路径缓存的磁盘用量: {路径: (采样时间, (总量, 已用, 可用, 使用率))}
+        self._disk_cache: Dict[str, tuple] = {}
+        self._if_stats_cache: Optional[Dict[str, Any]] = None
+        self._if_stats_ts = 0.0
+        
+        # 后台采样线程，运行时 get_system_stats 直接返回线程维护的最新快照
+        self.sample_period = sample_period
+        self._snapshot_lock = threading.Lock()
+        # 采样线程与查询线程都会读写采样状态(网络计数、每日统计、频率信息及各项缓存)，
+        # 采样与缓存读写都在此锁内进行；采样过程中会再次进入缓存读取，因此使用可重入锁
+        self._state_lock = threading.RLock()
+        self._stop = threading.Event()
+        self._sampler_thread: Optional[threading.Thread] = None
+        
+        # 上一次采样的网络计数: (发送字节, 接收字节, 时间戳)，用于计算带宽
+        self._prev_net: Optional[tuple] = None
         self.platform_type = platform.system()
         
         # 每日统计相关
         self.daily_net_stats = None  # 当天零点时的网络数据
-        self.daily_reset_date = None  # 最后一次重置的日期
+        self._daily_reset_ordinal: Optional[int] = None  # 最后一次重置的日期序数 (date.toordinal)
+        self._today_str = ""  # daily_reset_date 的显示字符串，重置时更新
         
         # 立即初始化一次网络统计，避免第一次查询时速度为0
         try:
             net = psutil.net_io_counters()
-            self.previous_net_stats = net
-            self.previous_timestamp = time.time()
+            self._prev_net = (net.bytes_sent, net.bytes_recv, time.time())
             
             # 初始化每日统计
             self.daily_net_stats = net
-            self.daily_reset_date = date.today()
-            self.logger.info(f"网络监控已初始化，每日统计重置日期: {self.daily_reset_date}")
+            today = date.today()
+            self._daily_reset_ordinal = today.toordinal()
+            self._today_str = today.strftime('%Y-%m-%d')
+            self.logger.info(f"网络监控已初始化，每日统计重置日期: {today}")
         except Exception as e:
             self.logger.warning(f"初始化网络统计失败: {e}")
     
-    def _check_daily_reset(self):
-        """检查是否需要重置每日统计"""
-        today = date.today()
-        if self.daily_reset_date != today:
-            try:
-                net = psutil.net_io_counters()
-                self.daily_net_stats = net
-                self.daily_reset_date = today
-                self.logger.info(f"每日网络统计已重置，新日期: {today}")
-            except Exception as e:
-                self.logger.error(f"重置每日统计失败: {e}")
+    @property
+    def daily_reset_date(self) -> Optional[date]:
+        """最后一次重置每日统计的日期"""
+        if self._daily_reset_ordinal is None:
+            return None
+        return date.fromordinal(self._daily_reset_ordinal)
+    
+    def _check_daily_reset(self, net):
+        """检查是否需要重置每日统计，net 为本次采样的网络计数"""
+        today_ord = date.today().toordinal()
+        if today_ord != self._daily_reset_ordinal:
+            today = date.fromordinal(today_ord)
+            self.daily_net_stats = net
+            self._daily_reset_ordinal = today_ord
+            self._today_str = today.strftime('%Y-%m-%d')
+            self.logger.info(f"每日网络统计已重置，新日期: {today}")
+    
+    def _compute_daily(self, net) -> tuple:
+        """根据本次采样的网络计数计算当天的使用量 (发送字节, 接收字节)"""
+        # 检查是否需要重置
+        self._check_daily_reset(net)
+        
+        if self.daily_net_stats is None:
+            return (0, 0)
+        
+        # 计算当天的使用量 = 当前值 - 当天零点的值
+        daily_sent = net.bytes_sent - self.daily_net_stats.bytes_sent
+        daily_recv = net.bytes_recv - self.daily_net_stats.bytes_recv
+        
+        # 防止负数
+        if daily_sent < 0:
+            daily_sent = 0
+        if daily_recv < 0:
+            daily_recv = 0
+        
+        return (daily_sent, daily_recv)
+    
+    def _sample_cpu_percent(self) -> float:
+        """读取自上次采样以来的 CPU 使用率
+        
+        距上次采样不足 MIN_CPU_SAMPLE_INTERVAL 时(如创建后立即查询)，
+        只阻塞等待剩余的时间，其余情况不阻塞。
+        """
+        wait = self.MIN_CPU_SAMPLE_INTERVAL - (time.monotonic() - self._last_cpu_sample_t)
+        cpu_percent = psutil.cpu_percent(interval=wait if wait > 0 else None)
+        self._last_cpu_sample_t = time.monotonic()
+        return cpu_percent
+    
+    def start(self):
+        """启动后台采样线程"""
+        if self._sampler_thread and self._sampler_thread.is_alive():
+            self.logger.warning("系统监控采样线程已在运行")
+            return
+        
+        # 先同步采样一次，线程启动后读取方总能拿到快照
+        self._update_snapshot()
+        
+        self._stop.clear()
+        self._sampler_thread = threading.Thread(
+            target=self._sampler_loop,
+            daemon=True,
+            name="SystemMonitor"
+        )
+        self._sampler_thread.start()
+        self.logger.info(f"系统监控采样已启动 (采样间隔: {self.sample_period}秒)")
+    
+    def shutdown(self):
+        """停止后台采样线程"""
+        self._stop.set()
+        if self._sampler_thread and self._sampler_thread.is_alive():
+            self._sampler_thread.join(timeout=5)
+            self.logger.info("系统监控采样已停止")
+        self._sampler_thread = None
+    
+    def _sampler_loop(self):
+        """后台采样线程函数"""
+        while not self._stop.wait(self.sample_period):
+            self._update_snapshot()
+    
+    def _update_snapshot(self) -> Optional[SystemStats]:
+        """采样一次并替换最新快照，采样失败时保留上一次的快照并返回 None"""
+        with self._state_lock:
+            stats = self._collect_stats()
+        if stats is None:
+            return None
+        with self._snapshot_lock:
+            self._stats_cache = stats
+            self._stats_cache_ts = time.monotonic()
+        return stats
+    
+    def _get_disk_usage(self, path: str) -> tuple:
+        """获取磁盘用量，DISK_CACHE_TTL 内重复查询返回缓存结果"""
+        with self._state_lock:
+            now = time.monotonic()
+            cached = self._disk_cache.get(path)
+            if cached is not None and now - cached[0] < self.DISK_CACHE_TTL:
+                return cached[1]
+            
+            usage = _disk_usage(path)
+            self._disk_cache[path] = (now, usage)
+            return usage
+    
+    def _get_if_stats(self) -> Dict[str, Any]:
+        """获取各网卡状态，IF_STATS_CACHE_TTL 内重复查询返回缓存结果"""
+        with self._state_lock:
+            now = time.monotonic()
+            if self._if_stats_cache is None or now - self._if_stats_ts >= self.IF_STATS_CACHE_TTL:
+                self._if_stats_cache = psutil.net_if_stats()
+                self._if_stats_ts = now
+            return self._if_stats_cache
     
     def get_system_stats(self) -> Optional[SystemStats]:
-        """获取系统统计信息"""
+        """获取系统统计信息
+        
+        后台采样线程运行时直接返回最新快照，不调用 psutil；
+        否则按需采样，距上次采样不足 MIN_SAMPLE_INTERVAL 时返回缓存结果。
+        """
+        with self._snapshot_lock:
+            if self._sampler_thread is not None:
+                return self._stats_cache
+            if (self._stats_cache is not None and
+                    time.monotonic() - self._stats_cache_ts < self.MIN_SAMPLE_INTERVAL):
+                return self._stats_cache
+        
+        return self._update_snapshot()
+    
+    def _collect_stats(self) -> Optional[SystemStats]:
+        """从 psutil 读取一次系统统计信息"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = self._sample_cpu_percent()
             cpu_count = psutil.cpu_count()
-            cpu_freq = psutil.cpu_freq().current if psutil.cpu_freq() else 0
+            # 每次采样只读取一次每核心频率，平均频率与详细频率信息都由这次读取得到
+            cpu_info = self._read_cpu_info()
+            self._cpu_info = cpu_info
+            cpu_freq = cpu_info['current'] if cpu_info else 0
             
             memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            disk_total, disk_used, disk_free, disk_percent = self._get_disk_usage('/')
             net = psutil.net_io_counters()
             current_timestamp = time.time()
             
@@ -81,26 +334,24 @@ class SystemMonitor:
             net_recv_speed = 0.0
             
             # 计算带宽速度
-            if self.previous_net_stats is not None and self.previous_timestamp is not None:
-                time_delta = current_timestamp - self.previous_timestamp
+            if self._prev_net is not None:
+                prev_sent, prev_recv, prev_ts = self._prev_net
+                time_delta = current_timestamp - prev_ts
                 
                 if time_delta > 0:
-                    sent_delta = net.bytes_sent - self.previous_net_stats.bytes_sent
-                    recv_delta = net.bytes_recv - self.previous_net_stats.bytes_recv
-                    
-                    # 转换为 MB/s
-                    net_sent_speed = (sent_delta / (1024 * 1024)) / time_delta
-                    net_recv_speed = (recv_delta / (1024 * 1024)) / time_delta
-                    
                     # 防止负数（可能是系统重启或网络重置）
-                    if net_sent_speed < 0:
-                        net_sent_speed = 0.0
-                    if net_recv_speed < 0:
-                        net_recv_speed = 0.0
+                    sent_delta = max(0, net.bytes_sent - prev_sent)
+                    recv_delta = max(0, net.bytes_recv - prev_recv)
+                    
+                    # 转换为 MB/s，两个方向共用同一个倒数
+                    inv_dt_mb = 1.0 / (time_delta * 1048576.0)
+                    net_sent_speed = sent_delta * inv_dt_mb
+                    net_recv_speed = recv_delta * inv_dt_mb
             
             # 更新前一次的数据
-            self.previous_net_stats = net
-            self.previous_timestamp = current_timestamp
+            self._prev_net = (net.bytes_sent, net.bytes_recv, current_timestamp)
+            
+            daily_sent, daily_recv = self._compute_daily(net)
             
             boot_time = psutil.boot_time()
             
@@ -111,16 +362,18 @@ class SystemMonitor:
                 memory_used=memory.used,
                 memory_total=memory.total,
                 memory_percent=memory.percent,
-                disk_used=disk.used,
-                disk_total=disk.total,
-                disk_percent=disk.percent,
-                disk_free=disk.free,
+                disk_used=disk_used,
+                disk_total=disk_total,
+                disk_percent=disk_percent,
+                disk_free=disk_free,
                 net_sent=net.bytes_sent,
                 net_recv=net.bytes_recv,
                 net_sent_speed=net_sent_speed,
                 net_recv_speed=net_recv_speed,
                 boot_time=boot_time,
-                timestamp=current_timestamp
+                timestamp=current_timestamp,
+                daily_sent=daily_sent,
+                daily_recv=daily_recv
             )
             
             return stats
@@ -131,54 +384,48 @@ class SystemMonitor:
     
     def get_daily_network_usage(self) -> tuple:
         """获取当天的网络使用量 (发送字节, 接收字节)"""
-        try:
-            # 检查是否需要重置
-            self._check_daily_reset()
-            
-            net = psutil.net_io_counters()
-            
-            if self.daily_net_stats is None:
-                return (0, 0)
-            
-            # 计算当天的使用量 = 当前值 - 当天零点的值
-            daily_sent = net.bytes_sent - self.daily_net_stats.bytes_sent
-            daily_recv = net.bytes_recv - self.daily_net_stats.bytes_recv
-            
-            # 防止负数
-            if daily_sent < 0:
-                daily_sent = 0
-            if daily_recv < 0:
-                daily_recv = 0
-            
-            return (daily_sent, daily_recv)
-            
-        except Exception as e:
-            self.logger.error(f"获取每日网络使用量失败: {e}")
+        stats = self.get_system_stats()
+        if stats is None:
             return (0, 0)
+        return (stats.daily_sent, stats.daily_recv)
     
     def format_bytes(self, bytes_value: int) -> str:
         """格式化字节数为可读格式"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes_value < 1024.0:
-                return f"{bytes_value:.2f} {unit}"
-            bytes_value /= 1024.0
-        return f"{bytes_value:.2f} PB"
+        return _format_bytes(bytes_value)
     
     def format_speed(self, speed_mbps: float) -> str:
         """格式化网络速度为可读格式"""
-        if speed_mbps < 0.01:
-            speed_kbps = speed_mbps * 1024
-            return f"{speed_kbps:.2f} KB/s"
-        elif speed_mbps < 1000:
-            return f"{speed_mbps:.2f} MB/s"
-        else:
-            speed_gbps = speed_mbps / 1024
-            return f"{speed_gbps:.2f} GB/s"
+        return _format_speed(speed_mbps)
+    
+    def get_detailed_cpu_info(self) -> Optional[Dict[str, Any]]:
+        """获取详细的CPU频率信息，取自最近一次系统统计采样(返回副本)"""
+        self.get_system_stats()
+        with self._state_lock:
+            cpu_info = self._cpu_info
+            if cpu_info is None:
+                return None
+            return {**cpu_info, 'current_list': list(cpu_info['current_list'])}
+    
+    def _detect_cpu_freq(self) -> Optional[Callable]:
+        """检测当前平台能否读取CPU频率，能则返回读取函数"""
+        cpu_freq = getattr(psutil, 'cpu_freq', None)
+        if cpu_freq is None:
+            return None
+        try:
+            if cpu_freq(percpu=True):
+                return cpu_freq
+        except Exception as e:
+            self.logger.debug(f"获取CPU频率信息失败: {e}")
+        self.logger.info("当前平台不支持读取CPU频率，系统信息中将不显示频率")
+        return None
     
-    def get_detailed_cpu_info(self) -> Dict[str, Any]:
-        """获取详细的CPU频率信息"""
+    def _read_cpu_info(self) -> Optional[Dict[str, Any]]:
+        """读取每个核心的CPU频率"""
+        if self._cpu_freq_fn is None:
+            return None
+        
         try:
-            cpu_freq = psutil.cpu_freq(percpu=True)  # 获取每个核心的频率
+            cpu_freq = self._cpu_freq_fn(percpu=True)  # 获取每个核心的频率
             
             if cpu_freq:
                 # 当前频率（所有核心）
@@ -207,19 +454,26 @@ class SystemMonitor:
     def get_uptime_string(self, boot_time: float) -> str:
         """获取系统运行时间字符串"""
         try:
-            uptime_seconds = datetime.now().timestamp() - boot_time
+            uptime_seconds = int(time.time() - boot_time)
             
-            days = int(uptime_seconds // 86400)
-            hours = int((uptime_seconds % 86400) // 3600)
-            minutes = int((uptime_seconds % 3600) // 60)
-            seconds = int(uptime_seconds % 60)
+            # 同一秒内重复查询直接返回上次的结果(缓存为整体替换的元组，读一次即可)
+            cached = self._uptime_cache
+            if cached is not None and cached[0] == uptime_seconds:
+                return cached[1]
+            
+            days, rem = divmod(uptime_seconds, 86400)
+            hours, rem = divmod(rem, 3600)
+            minutes, seconds = divmod(rem, 60)
             
             if days > 0:
-                return f"{days}天 {hours}小时 {minutes}分钟"
+                uptime = f"{days}天 {hours}小时 {minutes}分钟"
             elif hours > 0:
-                return f"{hours}小时 {minutes}分钟"
+                uptime = f"{hours}小时 {minutes}分钟"
             else:
-                return f"{minutes}分钟 {seconds}秒"
+                uptime = f"{minutes}分钟 {seconds}秒"
+            
+            self._uptime_cache = (uptime_seconds, uptime)
+            return uptime
                 
         except Exception as e:
             self.logger.error(f"计算运行时间失败: {e}")
@@ -239,20 +493,6 @@ class SystemMonitor:
         # 获取详细CPU信息
         cpu_info = self.get_detailed_cpu_info()
         
-        # 获取每日流量
-        daily_sent, daily_recv = self.get_daily_network_usage()
-        daily_sent_str = self.format_bytes(daily_sent)
-        daily_recv_str = self.format_bytes(daily_recv)
-        
-        # 获取累计流量（系统启动后）
-        system_sent_str = self.format_bytes(stats.net_sent)
-        system_recv_str = self.format_bytes(stats.net_recv)
-        
-        net_sent_speed = self.format_speed(stats.net_sent_speed)
-        net_recv_speed = self.format_speed(stats.net_recv_speed)
-        
-        today_str = date.today().strftime('%Y-%m-%d')
-        
         # 构建CPU信息字符串
         if cpu_info:
             cpu_freq_info = f"  当前: {cpu_info['current']:.2f} MHz (最小 {cpu_info['min']:.2f} MHz, 最大 {cpu_info['max']:.2f} MHz)\n"
@@ -265,66 +505,78 @@ class SystemMonitor:
                 core_freqs_str += f"{freq:.1f}MHz "
             core_freqs_str += "\n"
         else:
-            cpu_freq_info = f"  当前: {stats.cpu_freq:.2f} MHz\n"
+            # 无法读取频率时不显示频率信息
+            cpu_freq_info = ""
             core_freqs_str = ""
         
-        message = (
-            "系统监控信息\n"
-            "━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            f"系统: {self.platform_type}\n"
-            f"运行时间: {uptime}\n"
-            f"更新时间: {datetime.fromtimestamp(stats.timestamp).strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-            
-            f"CPU信息:\n"
-            f"  核心数: {stats.cpu_count}\n"
-            f"{cpu_freq_info}"
-            f"{core_freqs_str}"
-            f"  使用率: {cpu_status} {stats.cpu_percent:.1f}%\n\n"
-            
-            f"内存信息:\n"
-            f"  已用: {self.format_bytes(stats.memory_used)}\n"
-            f"  总量: {self.format_bytes(stats.memory_total)}\n"
-            f"  使用率: {mem_status} {stats.memory_percent:.1f}%\n\n"
-            
-            f"硬盘信息 (/):\n"
-            f"  已用: {self.format_bytes(stats.disk_used)}\n"
-            f"  可用: {self.format_bytes(stats.disk_free)}\n"
-            f"  总量: {self.format_bytes(stats.disk_total)}\n"
-            f"  使用率: {disk_status} {stats.disk_percent:.1f}%\n\n"
-            
-            f"网络流量 (今日 {today_str}):\n"
-            f"  上传: {daily_sent_str}\n"
-            f"  下载: {daily_recv_str}\n\n"
-            
-            f"网络流量 (系统启动后):\n"
-            f"  上传: {system_sent_str}\n"
-            f"  下载: {system_recv_str}\n\n"
-            
-            f"实时带宽:\n"
-            f"  上传速度: {net_sent_speed}\n"
-            f"  下载速度: {net_recv_speed}\n"
-            f"━━━━━━━━━━━━━━━━━━━━━━━━━━"
+        return self.SYSTEM_INFO_TEMPLATE.format(
+            platform=self.platform_type,
+            uptime=uptime,
+            update_time=datetime.fromtimestamp(stats.timestamp).strftime('%Y-%m-%d %H:%M:%S'),
+            cpu_count=stats.cpu_count,
+            cpu_freq_info=cpu_freq_info,
+            core_freqs=core_freqs_str,
+            cpu_status=cpu_status,
+            cpu_percent=stats.cpu_percent,
+            memory_used=self.format_bytes(stats.memory_used),
+            memory_total=self.format_bytes(stats.memory_total),
+            mem_status=mem_status,
+            memory_percent=stats.memory_percent,
+            disk_used=self.format_bytes(stats.disk_used),
+            disk_free=self.format_bytes(stats.disk_free),
+            disk_total=self.format_bytes(stats.disk_total),
+            disk_status=disk_status,
+            disk_percent=stats.disk_percent,
+            today=self._today_str,
+            daily_sent=self.format_bytes(stats.daily_sent),
+            daily_recv=self.format_bytes(stats.daily_recv),
+            net_sent=self.format_bytes(stats.net_sent),
+            net_recv=self.format_bytes(stats.net_recv),
+            net_sent_speed=self.format_speed(stats.net_sent_speed),
+            net_recv_speed=self.format_speed(stats.net_recv_speed)
         )
+    
+    def _find_processes(self, process_name: str) -> Dict[int, psutil.Process]:
+        """返回名称包含 process_name 的进程 {PID: Process}
         
-        return message
+        process_iter 会复用上次返回的 Process 对象并检查PID是否被复用，
+        进程的 cpu_percent 因此能计算两次查询之间的使用率。
+        """
+        key = process_name.lower()
+        return {
+            proc.pid: proc
+            for proc in psutil.process_iter(['name'])
+            if key in (proc.info['name'] or '').lower()
+        }
     
     def get_process_info(self, process_name: str = "java") -> str:
         """获取特定进程的信息"""
         try:
-            matching_processes = []
-            
-            for proc in psutil.process_iter(['pid', 'name', 'memory_percent', 'cpu_percent']):
-                try:
-                    if process_name.lower() in proc.info['name'].lower():
-                        matching_processes.append(proc.info)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            with self._proc_lock:
+                matches = self._find_processes(process_name)
+                
+                matching_processes = []
+                for pid in sorted(matches):
+                    proc = matches[pid]
+                    try:
+                        # oneshot 内多次读取共用同一次 /proc 读取结果
+                        with proc.oneshot():
+                            matching_processes.append({
+                                'pid': pid,
+                                'name': proc.name(),
+                                'memory_percent': proc.memory_percent(),
+                                'cpu_percent': proc.cpu_percent(interval=None)
+                            })
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        continue
             
             if not matching_processes:
                 return f"未找到进程: {process_name}"
             
-            message = f"进程信息 ({process_name}):\n"
-            message += "━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+            parts = [f"进程信息 ({process_name}):\n", "━━━━━━━━━━━━━━━━━━━━━━━━━━\n"]
+            
+            if self._memory_total is None:
+                self._memory_total = psutil.virtual_memory().total
             
             total_memory = 0
             for proc in matching_processes:
@@ -332,18 +584,18 @@ class SystemMonitor:
                 cpu_usage = proc['cpu_percent']
                 total_memory += memory_usage
                 
-                memory_bytes = int(psutil.virtual_memory().total * memory_usage / 100)
-                message += (
+                memory_bytes = int(self._memory_total * memory_usage / 100)
+                parts.append(
                     f"PID: {proc['pid']}\n"
                     f"  名称: {proc['name']}\n"
                     f"  内存: {memory_usage:.2f}% ({self.format_bytes(memory_bytes)})\n"
                     f"  CPU: {cpu_usage:.2f}%\n\n"
                 )
             
-            message += f"总内存占用: {total_memory:.2f}%\n"
-            message += "━━━━━━━━━━━━━━━━━━━━━━━━━━"
+            parts.append(f"总内存占用: {total_memory:.2f}%\n")
+            parts.append("━━━━━━━━━━━━━━━━━━━━━━━━━━")
             
-            return message
+            return ''.join(parts)
             
         except Exception as e:
             self.logger.error(f"获取进程信息失败: {e}")
@@ -352,21 +604,17 @@ class SystemMonitor:
     def get_disk_info(self, path: str = "/") -> str:
         """获取详细的磁盘信息"""
         try:
-            disk = psutil.disk_usage(path)
+            total, used, free, percent = self._get_disk_usage(path)
             
-            used_percent = disk.percent
-            bar_length = 20
-            used_bars = int(bar_length * used_percent / 100)
-            empty_bars = bar_length - used_bars
-            bar = "█" * used_bars + "░" * empty_bars
+            bar = _DISK_BARS[int(_DISK_BAR_LENGTH * percent / 100)]
             
             message = (
                 f"磁盘信息 ({path}):\n"
                 f"━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                f"总容量: {self.format_bytes(disk.total)}\n"
-                f"已使用: {self.format_bytes(disk.used)}\n"
-                f"可用: {self.format_bytes(disk.free)}\n"
-                f"使用率: {disk.percent:.1f}%\n"
+                f"总容量: {self.format_bytes(total)}\n"
+                f"已使用: {self.format_bytes(used)}\n"
+                f"可用: {self.format_bytes(free)}\n"
+                f"使用率: {percent:.1f}%\n"
                 f"[{bar}]\n"
                 f"━━━━━━━━━━━━━━━━━━━━━━━━━━"
             )
@@ -386,9 +634,8 @@ class SystemMonitor:
                 return "无法获取网络信息"
             
             # 获取每日流量
-            daily_sent, daily_recv = self.get_daily_network_usage()
-            daily_sent_str = self.format_bytes(daily_sent)
-            daily_recv_str = self.format_bytes(daily_recv)
+            daily_sent_str = self.format_bytes(stats.daily_sent)
+            daily_recv_str = self.format_bytes(stats.daily_recv)
             
             # 获取累计流量
             system_sent_str = self.format_bytes(stats.net_sent)
@@ -397,32 +644,33 @@ class SystemMonitor:
             net_sent_speed = self.format_speed(stats.net_sent_speed)
             net_recv_speed = self.format_speed(stats.net_recv_speed)
             
-            net_if_stats = psutil.net_if_stats()
-            today_str = date.today().strftime('%Y-%m-%d')
-            
-            message = "网络信息\n"
-            message += "━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            
-            message += f"今日流量 ({today_str}):\n"
-            message += f"  上传: {daily_sent_str}\n"
-            message += f"  下载: {daily_recv_str}\n\n"
-            
-            message += f"累计流量 (系统启动后):\n"
-            message += f"  上传: {system_sent_str}\n"
-            message += f"  下载: {system_recv_str}\n\n"
-            
-            message += f"实时带宽:\n"
-            message += f"  上传速度: {net_sent_speed}\n"
-            message += f"  下载速度: {net_recv_speed}\n\n"
+            net_if_stats = self._get_if_stats()
             
-            message += "网卡状态:\n"
+            parts = [
+                "网络信息\n",
+                "━━━━━━━━━━━━━━━━━━━━━━━━━━\n",
+                
+                f"今日流量 ({self._today_str}):\n",
+                f"  上传: {daily_sent_str}\n",
+                f"  下载: {daily_recv_str}\n\n",
+                
+                "累计流量 (系统启动后):\n",
+                f"  上传: {system_sent_str}\n",
+                f"  下载: {system_recv_str}\n\n",
+                
+                "实时带宽:\n",
+                f"  上传速度: {net_sent_speed}\n",
+                f"  下载速度: {net_recv_speed}\n\n",
+                
+                "网卡状态:\n"
+            ]
             for interface, stat in net_if_stats.items():
                 status = "在线" if stat.isup else "离线"
-                message += f"  {interface}: {status}\n"
+                parts.append(f"  {interface}: {status}\n")
             
-            message += "━━━━━━━━━━━━━━━━━━━━━━━━━━"
+            parts.append("━━━━━━━━━━━━━━━━━━━━━━━━━━")
             
-            return message
+            return ''.join(parts)
             
         except Exception as e:
             self.logger.error(f"获取网络信息失败: {e}")
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import logging
+
+from qq_bot_server import QQBotWebSocketServer
+
+
+def test_group_message_payload_matches_json_dumps():
+    message = '区块监控告警:\n"quoted" \\ {braces} %s'
+    payload = QQBotWebSocketServer._group_message_payload(123456, json.dumps(message))
+    request = json.loads(payload)
+    assert payload == json.dumps({
+        "action": "send_group_msg",
+        "echo": request["echo"],
+        "params": {
+            "group_id": 123456,
+            "message": message,
+            "auto_escape": False
+        }
+    })
+
+
+def _server() -> QQBotWebSocketServer:
+    server = QQBotWebSocketServer.__new__(QQBotWebSocketServer)
+    server.logger = logging.getLogger(__name__)
+    server._output_encoding = None
+    return server
+
+
+def test_decode_line_probes_gbk_first():
+    server = _server()
+    assert server._decode_line('服务器已启动'.encode('gbk')) == '服务器已启动'
+    assert server._output_encoding == 'gbk'
+
+
+def test_truncated_line_does_not_corrupt_the_next_one():
+    server = _server()
+    server._decode_line('玩家加入'.encode('utf-8'))
+    assert server._output_encoding == 'utf-8'
+    server._decode_line('玩家'.encode('utf-8')[:-1])
+    assert server._decode_line('离开'.encode('utf-8')) == '离开'
+
+
+def _log_server(tmp_path) -> QQBotWebSocketServer:
+    server = _server()
+    server.server_log_file = None
+    server._log_queue = None
+    server._log_writer_task = None
+    server.log_dir = str(tmp_path)
+    server.log_file_path = str(tmp_path / 'latest.log')
+    server.max_log_file_size = 10 * 1024 * 1024
+    server.backup_count = 3
+    return server
+
+
+def test_log_writer_writes_every_line_before_closing(tmp_path):
+    async def run():
+        server = _log_server(tmp_path)
+        await server._setup_log_file()
+        log_file = server.server_log_file
+        for i in range(1000):
+            server._write_to_log_file(f"line {i}")
+        # 写入任务尚未运行就关闭，队列中的日志也要写完
+        await server._close_log_file()
+        assert log_file.closed
+        assert server.server_log_file is None
+    
+    asyncio.run(run())
+    assert (tmp_path / 'latest.log').read_text(encoding='utf-8').splitlines() == [
+        f"line {i}" for i in range(1000)
+    ]
+
+
+def test_log_file_can_be_reopened_after_closing(tmp_path):
+    async def run():
+        server = _log_server(tmp_path)
+        await server._setup_log_file()
+        server._write_to_log_file("first")
+        await server._setup_log_file()
+        server._write_to_log_file("second")
+        await server._close_log_file()
+        # 重复关闭不应出错
+        await server._close_log_file()
+    
+    asyncio.run(run())
+    assert (tmp_path / 'latest.log').read_text(encoding='utf-8').splitlines() == ["first", "second"]
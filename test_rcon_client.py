@@ -0,0 +1,46 @@
+import logging
+
+from rcon_client import RCONClient
+
+
+def _client() -> RCONClient:
+    return RCONClient('localhost', 25575, '', logging.getLogger(__name__))
+
+
+def test_specific_count_format_wins_over_earlier_generic_match():
+    info = _client()._parse_list_response(
+        '[Lobby 1/2] There are 3 of a max of 20 players online: a, b, c'
+    )
+    assert info.current_players == 3
+    assert info.max_players == 20
+    assert info.player_names == ['a', 'b', 'c']
+
+
+def test_generic_count_format_is_the_fallback():
+    info = _client()._parse_list_response('Online 2/10: Steve, Alex')
+    assert info.current_players == 2
+    assert info.max_players == 10
+    assert info.player_names == ['Steve', 'Alex']
+
+
+def test_whitespace_separated_names_are_split():
+    info = _client()._parse_list_response(
+        'There are 3 of a max of 20 players online: Steve\t Alex\nNotch'
+    )
+    assert info.player_names == ['Steve', 'Alex', 'Notch']
+
+
+def test_single_name_is_kept_whole():
+    info = _client()._parse_list_response('There are 1 of a max of 20 players online: Steve')
+    assert info.player_names == ['Steve']
+
+
+def test_cached_player_list_is_not_shared_between_callers():
+    client = _client()
+    client.execute_command = lambda command: 'There are 2 of a max of 20 players online: Steve, Alex'
+    first = client.get_player_list()
+    first.player_names.append('Notch')
+    first.current_players = 3
+    second = client.get_player_list()
+    assert second.current_players == 2
+    assert second.player_names == ['Steve', 'Alex']
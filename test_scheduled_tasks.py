@@ -0,0 +1,148 @@
+import asyncio
+import datetime
+import heapq
+import logging
+import time
+from types import SimpleNamespace
+
+from scheduled_tasks import ScheduledTaskManager
+
+
+def _manager(scheduled_config=None) -> ScheduledTaskManager:
+    config_manager = SimpleNamespace(config={'scheduled_tasks': scheduled_config or {}})
+    qq_server = SimpleNamespace(server_process=None)
+    return ScheduledTaskManager(config_manager, qq_server, logging.getLogger(__name__))
+
+
+def test_restart_right_after_stop_leaves_one_loop():
+    async def run():
+        manager = _manager()
+        manager.start()
+        old_loop = manager.scheduler_task
+        await asyncio.sleep(0)
+        
+        manager.stop()
+        manager.start()
+        await asyncio.sleep(0.05)
+        
+        assert old_loop.done()
+        assert not manager.scheduler_task.done()
+        manager.stop()
+        await asyncio.wait_for(manager.scheduler_task, 1)
+    
+    asyncio.run(run())
+
+
+# 2026-10-16 是星期五
+FRIDAY = datetime.datetime(2026, 10, 16)
+
+
+def _task_manager(weekdays=(0, 1, 2, 3, 4, 5, 6)) -> ScheduledTaskManager:
+    return _manager({
+        'enabled': True,
+        'auto_start': {'enabled': True, 'times': ['03:00'], 'weekdays': list(weekdays)},
+    })
+
+
+def _next_fire(manager: ScheduledTaskManager, after: datetime.datetime) -> datetime.datetime:
+    fire_ts = manager._next_fire_time(manager.tasks[0], after.timestamp())
+    return datetime.datetime.fromtimestamp(fire_ts)
+
+
+def test_next_fire_time_later_the_same_day():
+    manager = _task_manager()
+    assert _next_fire(manager, FRIDAY.replace(hour=2)) == FRIDAY.replace(hour=3)
+
+
+def test_next_fire_time_includes_the_current_minute():
+    manager = _task_manager()
+    assert _next_fire(manager, FRIDAY.replace(hour=3, second=30)) == FRIDAY.replace(hour=3)
+
+
+def test_next_fire_time_rolls_over_to_the_next_day():
+    manager = _task_manager()
+    assert _next_fire(manager, FRIDAY.replace(hour=4)) == datetime.datetime(2026, 10, 17, 3)
+
+
+def test_next_fire_time_skips_to_the_next_allowed_weekday():
+    manager = _task_manager(weekdays=[0])
+    assert _next_fire(manager, FRIDAY.replace(hour=2)) == datetime.datetime(2026, 10, 19, 3)
+
+
+def test_next_fire_time_wraps_to_the_same_weekday_next_week():
+    manager = _task_manager(weekdays=[4])
+    assert _next_fire(manager, FRIDAY.replace(hour=4)) == datetime.datetime(2026, 10, 23, 3)
+
+
+def test_next_fire_time_skips_the_minute_already_fired():
+    manager = _task_manager()
+    manager.tasks[0].last_fired_key = manager._minute_key(FRIDAY.replace(hour=3))
+    assert _next_fire(manager, FRIDAY.replace(hour=3, second=10)) == datetime.datetime(2026, 10, 17, 3)
+
+
+def test_disable_and_enable_rebuild_the_schedule():
+    manager = _task_manager()
+    task = manager.tasks[0]
+    manager._rebuild_schedule()
+    assert [entry[3] for entry in manager._deadlines_heap] == [task]
+    
+    assert manager.disable_task(task.task_id)
+    assert manager._deadlines_heap == []
+    
+    assert manager.enable_task(task.task_id)
+    assert [entry[3] for entry in manager._deadlines_heap] == [task]
+
+
+def _run_events(manager: ScheduledTaskManager, events) -> tuple:
+    """启动调度循环并放入给定事件 (事件时间, 事件类型, 任务执行时间)，返回执行与通知记录"""
+    executed, warned = [], []
+    
+    async def execute(task, fire_time):
+        executed.append(fire_time)
+    
+    async def warn(task, kind, fire_ts):
+        warned.append(kind)
+    
+    async def run():
+        manager._execute_task = execute
+        manager._send_task_warning = warn
+        manager.start()
+        task = manager.tasks[0]
+        for ts, kind, fire_ts in events:
+            heapq.heappush(manager._deadlines_heap, (ts, next(manager._heap_seq), kind, task, fire_ts))
+        manager._wake_event.set()
+        await asyncio.sleep(0.05)
+        manager.stop()
+        await asyncio.wait_for(manager.scheduler_task, 1)
+    
+    asyncio.run(run())
+    return executed, warned
+
+
+def test_due_task_fires_once_per_minute():
+    manager = _task_manager()
+    fire_ts = time.time() - 1
+    executed, _ = _run_events(manager, [(fire_ts, 'fire', fire_ts), (fire_ts, 'fire', fire_ts)])
+    assert executed == [datetime.datetime.fromtimestamp(fire_ts)]
+
+
+def test_overdue_task_is_skipped_and_rescheduled():
+    manager = _task_manager()
+    task = manager.tasks[0]
+    fire_ts = time.time() - 600
+    executed, _ = _run_events(manager, [(fire_ts, 'fire', fire_ts)])
+    
+    assert executed == []
+    assert task.last_fired_key == manager._minute_key(datetime.datetime.fromtimestamp(fire_ts))
+    fire_entries = [entry for entry in manager._deadlines_heap if entry[2] == 'fire']
+    assert fire_entries and all(entry[0] > time.time() for entry in fire_entries)
+
+
+def test_warning_for_a_passed_fire_time_is_dropped():
+    manager = _task_manager()
+    now = time.time()
+    _, warned = _run_events(manager, [
+        (now - 5, 'first_warning', now - 1),
+        (now - 5, 'second_warning', now + 60),
+    ])
+    assert warned == ['second_warning']
@@ -0,0 +1,49 @@
+import logging
+import time
+from datetime import date
+
+from system_monitor import SystemMonitor
+
+
+def _monitor(sample_period: float = 2) -> SystemMonitor:
+    return SystemMonitor(logging.getLogger(__name__), sample_period=sample_period)
+
+
+def test_sampler_publishes_a_snapshot_on_start_and_keeps_refreshing():
+    monitor = _monitor(sample_period=0.05)
+    monitor.start()
+    try:
+        first = monitor.get_system_stats()
+        assert first is not None
+        # 线程运行时两次查询之间不采样，返回同一个快照
+        assert monitor.get_system_stats() is first
+        
+        deadline = time.monotonic() + 2
+        while monitor.get_system_stats() is first and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert monitor.get_system_stats().timestamp > first.timestamp
+    finally:
+        monitor.shutdown()
+    assert monitor._sampler_thread is None
+
+
+def test_on_demand_sampling_reuses_recent_results():
+    monitor = _monitor()
+    first = monitor.get_system_stats()
+    assert first is not None
+    assert monitor.get_system_stats() is first
+    
+    monitor._stats_cache_ts -= monitor.MIN_SAMPLE_INTERVAL
+    assert monitor.get_system_stats() is not first
+
+
+def test_daily_traffic_resets_on_a_new_day():
+    monitor = _monitor()
+    monitor.get_system_stats()
+    monitor._daily_reset_ordinal -= 1
+    monitor._stats_cache_ts -= monitor.MIN_SAMPLE_INTERVAL
+    
+    stats = monitor.get_system_stats()
+    assert monitor.daily_reset_date == date.today()
+    assert (stats.daily_sent, stats.daily_recv) == (0, 0)
+